@@ -2,6 +2,7 @@ from contextlib import contextmanager
 from sqlalchemy import create_engine, text
 from sqlalchemy.orm import sessionmaker
 from sqlalchemy.pool import QueuePool
+import orjson
 import sys
 import os
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
@@ -21,18 +22,23 @@ DATABASE_PORT = settings.database_port
 # Construct database URL
 SQLALCHEMY_DATABASE_URL = f"postgresql+psycopg2://{DATABASE_USERNAME}:{DATABASE_PASSWORD}@{DATABASE_HOSTNAME}:{DATABASE_PORT}/{DATABASE_NAME}"
 
+
+def _json_serializer(obj) -> str:
+    """Serialize JSON columns with orjson (psycopg2 expects str, not bytes)"""
+    return orjson.dumps(obj).decode()
+
+
 # Create engine with connection pooling
 engine = create_engine(
     SQLALCHEMY_DATABASE_URL,
-    # poolclass=QueuePool,
-    # pool_size=5,
-    # max_overflow=10,
-    # pool_timeout=30,
-    # pool_pre_ping=True,
-    # pool_recycle=600,  # Reduced from 3600 to 600 seconds
-    # # Add these parameters for better connection management
-    # pool_use_lifo=True,
-    # echo=False,
+    json_serializer=_json_serializer,
+    json_deserializer=orjson.loads,
+    poolclass=QueuePool,
+    pool_size=settings.database_pool_size,
+    max_overflow=settings.database_max_overflow,
+    pool_timeout=settings.database_pool_timeout,
+    pool_pre_ping=True,  # Replace connections the server has dropped before handing them out
+    pool_recycle=settings.database_pool_recycle,
 )
 
 # Create session factory (remove scoped_session)
@@ -9,6 +9,13 @@ class Settings(BaseSettings):
     database_username: str
     database_name: str
 
+    # Connection pool; pool_size + max_overflow should stay below the server's
+    # connection limit across all API workers
+    database_pool_size: int = 20
+    database_max_overflow: int = 10
+    database_pool_timeout: int = 30
+    database_pool_recycle: int = 3600
+
     supabase_url: str
     supabase_key: str
 
@@ -20,6 +27,12 @@ class Settings(BaseSettings):
     # Encryption key for AWS credentials (should be 32 bytes base64 encoded)
     encryption_key: str
     
+    # Cache of ciphers derived from client passwords; 0 disables it
+    client_key_cache_size: int = 0
+    
+    # bcrypt work factor for new password hashes; existing hashes keep their own
+    bcrypt_rounds: int = 12
+    
     # JWT settings
     jwt_secret: str = "your-super-secret-jwt-key-change-this-in-production"
     jwt_algorithm: str = "HS256"
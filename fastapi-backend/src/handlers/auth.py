@@ -1,4 +1,4 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, status
 from sqlalchemy.orm import Session
 from datetime import datetime, timedelta
 from typing import Optional
@@ -18,10 +18,10 @@ from src.schemas.auth import (
     ForgotPasswordRequest,
     ResetPasswordRequest
 )
-from src.middleware.auth import get_current_user, get_current_active_user, get_current_context
+from src.middleware.auth import get_current_user, get_current_active_user, get_current_context, invalidate_user_cache
 from src.utils import (
-    hash_password,
-    verify_password,
+    hash_password_async,
+    verify_password_async,
     create_access_token,
     create_refresh_token,
     verify_token,
@@ -52,7 +52,7 @@ async def signup(
         )
     
     # Hash password
-    password_hash = hash_password(signup_data.password)
+    password_hash = await hash_password_async(signup_data.password)
     
     # Create a new tenant for the user (or you could implement logic to assign to existing tenant)
     new_tenant = Tenant(
@@ -104,7 +104,7 @@ async def signup(
     )
     
     # Create response
-    user_response = UserResponse.from_orm(new_user)
+    user_response = UserResponse.model_validate(new_user)
     token_response = TokenResponse(
         access_token=access_token,
         refresh_token=refresh_token,
@@ -137,7 +137,7 @@ async def signin(
         )
     
     # Verify password
-    if not verify_password(signin_data.password, user.password_hash):
+    if not await verify_password_async(signin_data.password, user.password_hash):
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Invalid email or password"
@@ -160,6 +160,7 @@ async def signin(
     # Update last login
     user.last_login = datetime.utcnow()
     db.commit()
+    invalidate_user_cache(user.id)
     
     # Create tokens with tenant information
     access_token_expires = timedelta(minutes=settings.jwt_access_token_expire_minutes)
@@ -180,7 +181,7 @@ async def signin(
     )
     
     # Create response
-    user_response = UserResponse.from_orm(user)
+    user_response = UserResponse.model_validate(user)
     token_response = TokenResponse(
         access_token=access_token,
         refresh_token=refresh_token,
@@ -224,7 +225,7 @@ async def refresh_token(
         )
     
     # Verify tenant still exists and matches
-    if not user.tenant_id or str(user.tenant_id) != tenant_id:
+    if not user.tenant_id or user.tenant_id != tenant_id:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Invalid tenant association"
@@ -249,7 +250,7 @@ async def refresh_token(
     )
     
     # Create response
-    user_response = UserResponse.from_orm(user)
+    user_response = UserResponse.model_validate(user)
     
     return TokenResponse(
         access_token=access_token,
@@ -267,7 +268,7 @@ async def get_current_user_profile(
     """
     Get current user profile
     """
-    return UserResponse.from_orm(current_user)
+    return UserResponse.model_validate(current_user)
 
 
 @router.post("/logout", response_model=MessageResponse)
@@ -295,19 +296,20 @@ async def change_password(
     Change user password
     """
     # Verify current password
-    if not verify_password(password_data.current_password, current_user.password_hash):
+    if not await verify_password_async(password_data.current_password, current_user.password_hash):
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Current password is incorrect"
         )
     
     # Hash new password
-    new_password_hash = hash_password(password_data.new_password)
+    new_password_hash = await hash_password_async(password_data.new_password)
     
     # Update user password
     current_user.password_hash = new_password_hash
     current_user.updated_at = datetime.utcnow()
     db.commit()
+    invalidate_user_cache(current_user.id)
     
     return MessageResponse(
         success=True,
@@ -332,6 +334,7 @@ async def complete_onboarding(
     # For now, we'll just mark it as completed
     
     db.commit()
+    invalidate_user_cache(current_user.id)
     
     return OnboardingResponse(
         success=True,
@@ -343,6 +346,7 @@ async def complete_onboarding(
 @router.post("/forgot-password", response_model=MessageResponse)
 async def forgot_password(
     request: ForgotPasswordRequest,
+    background_tasks: BackgroundTasks,
     db: Session = Depends(get_db_session)
 ):
     """
@@ -369,23 +373,17 @@ async def forgot_password(
     user.updated_at = datetime.utcnow()
     
     db.commit()
-    
-    # Send email
-    try:
-        user_name = f"{user.first_name} {user.last_name}".strip() or user.email
-        email_sent = await email_service.send_password_reset_email(
-            to_email=user.email,
-            reset_token=reset_token,
-            user_name=user_name
-        )
-        
-        if not email_sent:
-            # Log the error but still return success to user
-            print(f"Failed to send password reset email to {user.email}")
-            
-    except Exception as e:
-        # Log the error but still return success to user
-        print(f"Error sending password reset email: {str(e)}")
+    invalidate_user_cache(user.id)
+    
+    # Send email after the response goes out; the email service logs failures
+    # itself, and the user gets the same response either way
+    user_name = f"{user.first_name} {user.last_name}".strip() or user.email
+    background_tasks.add_task(
+        email_service.send_password_reset_email,
+        to_email=user.email,
+        reset_token=reset_token,
+        user_name=user_name
+    )
     
     return MessageResponse(
         success=True,
@@ -428,7 +426,7 @@ async def reset_password(
         )
     
     # Hash new password
-    new_password_hash = hash_password(request.new_password)
+    new_password_hash = await hash_password_async(request.new_password)
     
     # Update user password and clear reset token
     user.password_hash = new_password_hash
@@ -437,6 +435,7 @@ async def reset_password(
     user.updated_at = datetime.utcnow()
     
     db.commit()
+    invalidate_user_cache(user.id)
     
     return MessageResponse(
         success=True,
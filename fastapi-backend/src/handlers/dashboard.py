@@ -24,6 +24,9 @@ from src.middleware.auth import get_current_context, TenantContext
 
 api = APIRouter(prefix="/api/dashboard", tags=["Dashboard"])
 
+# Only the first resources found are shown, so no more models than this are built
+TOP_RESOURCES_LIMIT = 10
+
 
 class DashboardRequest(BaseModel):
     """Dashboard request model"""
@@ -177,6 +180,8 @@ def _process_scan_data(scans: List[CloudScan], service_results: List[ServiceScan
                 region
             )
     
+    last_scan_time = max(s.created_at for s in scans) if scans else None
+    
     # Create scan overview
     scan_overview = ScanOverview(
         total_scans=len(scans),
@@ -185,7 +190,7 @@ def _process_scan_data(scans: List[CloudScan], service_results: List[ServiceScan
         in_progress_scans=len([s for s in scans if s.status == 'RUNNING']),
         total_regions_scanned=len(region_counter),
         total_services_scanned=len(service_counter),
-        last_scan_time=max([s.created_at for s in scans]) if scans else None
+        last_scan_time=last_scan_time
     )
     
     # Create service metrics
@@ -194,7 +199,7 @@ def _process_scan_data(scans: List[CloudScan], service_results: List[ServiceScan
             service_name=service,
             resource_count=count,
             regions=list(service_regions[service]),
-            last_scan_time=max([s.created_at for s in scans]) if scans else None
+            last_scan_time=last_scan_time
         )
         for service, count in service_counter.items()
     ]
@@ -242,7 +247,7 @@ def _process_scan_data(scans: List[CloudScan], service_results: List[ServiceScan
         region_metrics=region_metrics,
         security_metrics=security_metrics_obj,
         resource_trends=resource_trends,
-        top_resources=top_resources[:10],  # Top 10 resources
+        top_resources=top_resources,
         scan_history=scan_history,
         alerts=alerts
     )
@@ -281,13 +286,14 @@ def _process_service_specific_data(
                 security_metrics['ec2_imds_v2_count'] += 1
             
             # Add to top resources
-            top_resources.append(TopResource(
-                name=instance.get('InstanceName', 'Unnamed Instance'),
-                type='EC2 Instance',
-                region=region,
-                risk_score=10 if instance.get('IMDSVersion') == 'IMDSv1' else 5,
-                status=instance.get('State', 'unknown')
-            ))
+            if len(top_resources) < TOP_RESOURCES_LIMIT:
+                top_resources.append(TopResource(
+                    name=instance.get('InstanceName', 'Unnamed Instance'),
+                    type='EC2 Instance',
+                    region=region,
+                    risk_score=10 if instance.get('IMDSVersion') == 'IMDSv1' else 5,
+                    status=instance.get('State', 'unknown')
+                ))
     
     elif service_name == 's3' and 'S3Buckets' in service_data:
         for bucket in service_data['S3Buckets']:
@@ -335,13 +341,14 @@ def _process_service_specific_data(
             if public_access == 'Not configured':
                 risk_score += 20
             
-            top_resources.append(TopResource(
-                name=bucket.get('BucketName', 'Unknown Bucket'),
-                type='S3 Bucket',
-                region=bucket.get('Region', 'unknown'),
-                risk_score=risk_score,
-                status='active'
-            ))
+            if len(top_resources) < TOP_RESOURCES_LIMIT:
+                top_resources.append(TopResource(
+                    name=bucket.get('BucketName', 'Unknown Bucket'),
+                    type='S3 Bucket',
+                    region=bucket.get('Region', 'unknown'),
+                    risk_score=risk_score,
+                    status='active'
+                ))
     
     elif service_name == 'ebs' and 'EBSVolumes' in service_data:
         for volume in service_data['EBSVolumes']:
@@ -360,13 +367,14 @@ def _process_service_specific_data(
                 })
             
             # Add to top resources
-            top_resources.append(TopResource(
-                name=volume.get('VolumeName', 'Unnamed Volume'),
-                type='EBS Volume',
-                region=region,
-                risk_score=10 if not volume.get('Encrypted', False) else 2,
-                status=volume.get('State', 'unknown')
-            ))
+            if len(top_resources) < TOP_RESOURCES_LIMIT:
+                top_resources.append(TopResource(
+                    name=volume.get('VolumeName', 'Unnamed Volume'),
+                    type='EBS Volume',
+                    region=region,
+                    risk_score=10 if not volume.get('Encrypted', False) else 2,
+                    status=volume.get('State', 'unknown')
+                ))
     
     elif service_name == 'security_groups' and 'SecurityGroups' in service_data:
         for sg in service_data['SecurityGroups']:
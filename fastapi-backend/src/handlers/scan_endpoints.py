@@ -23,6 +23,9 @@ def cleanup_thread_pool():
     thread_pool.shutdown(wait=True)
     logger.info("Thread pool executor shutdown complete")
 
+from sqlalchemy import JSON, cast, func, insert, update
+from sqlalchemy.dialects.postgresql import JSONB
+
 from dbschema.db_connector import get_db_session, get_db
 from dbschema.model import CloudScan, ServiceScanResult, User, Tenant
 from src.middleware.auth import get_tenant_scoped_context, get_current_context, TenantContext
@@ -31,6 +34,9 @@ from src.encryption import get_encryption_service
 
 api = APIRouter(prefix="/api/scan", tags=["AWS Scanning"])
 
+# Built once at import; values are bound per execution
+INSERT_CLOUD_SCAN = insert(CloudScan).returning(CloudScan.id)
+
 class AWSCloudScanRequest(BaseModel):
     """AWS Cloud Scan Request with encrypted credentials"""
     encrypted_aws_access_key: str
@@ -132,7 +138,8 @@ async def aws_cloud_scan(
     
     try:
         # Decrypt AWS credentials using the simple encryption service
-        logger.info("Starting credential decryption", extra={"scan_id": scan_id})
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("Starting credential decryption", extra={"scan_id": scan_id})
         
         try:
             encryption_service = get_encryption_service()
@@ -145,15 +152,16 @@ async def aws_cloud_scan(
             if request.encrypted_aws_session_token:
                 aws_session_token = encryption_service.decrypt(request.encrypted_aws_session_token)
             
-            logger.info(
-                "Credentials decrypted successfully", 
-                extra={
-                    "scan_id": scan_id,
-                    "has_access_key": bool(aws_access_key),
-                    "has_secret_key": bool(aws_secret_key),
-                    "has_session_token": bool(aws_session_token)
-                }
-            )
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug(
+                    "Credentials decrypted successfully",
+                    extra={
+                        "scan_id": scan_id,
+                        "has_access_key": bool(aws_access_key),
+                        "has_secret_key": bool(aws_secret_key),
+                        "has_session_token": bool(aws_session_token)
+                    }
+                )
             
         except Exception as e:
             logger.error(
@@ -185,38 +193,44 @@ async def aws_cloud_scan(
             )
         
         # Create CloudScan record
-        logger.info("Creating cloud scan record", extra={"scan_id": scan_id})
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("Creating cloud scan record", extra={"scan_id": scan_id})
 
         
     
-        cloud_scan = None
+        scan_timestamp = datetime.now().isoformat()
         
         try:
-            cloud_scan = CloudScan(
-                tenant_id=context.tenant_id,  # Use tenant_id instead of created_by
-                name=request.scan_name,
-                status="IN_PROGRESS",
-                cloud_provider="AWS",
-                cloud_scan_metadata={
-                    "excluded_regions": request.excluded_regions or [],
-                    "scan_options": request.scan_options,
-                    "initiated_by": str(context.user_id),
-                    "scan_timestamp": datetime.now().isoformat(),
-                    "total_regions_scanned": 17
+            # Core insert: the record is never re-read in this request, so skip
+            # the ORM unit of work and just take the generated id back
+            new_scan_id = db.execute(
+                INSERT_CLOUD_SCAN,
+                {
+                    "tenant_id": context.tenant_id,
+                    "name": request.scan_name,
+                    "status": "IN_PROGRESS",
+                    "cloud_provider": "AWS",
+                    "cloud_scan_metadata": {
+                        "excluded_regions": request.excluded_regions or [],
+                        "scan_options": request.scan_options,
+                        "initiated_by": str(context.user_id),
+                        "scan_timestamp": scan_timestamp,
+                        "total_regions_scanned": 17
+                    }
                 }
-            )
-            db.add(cloud_scan)
+            ).scalar_one()
             db.commit()
 
-            scan_id = str(cloud_scan.id)
+            scan_id = str(new_scan_id)
             
-            logger.info(
-                "Scan record created successfully",
-                extra={
-                    "tenant_id": str(context.tenant_id),
-                    "cloud_provider": "AWS"
-                }
-            )
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug(
+                    "Scan record created successfully",
+                    extra={
+                        "tenant_id": str(context.tenant_id),
+                        "cloud_provider": "AWS"
+                    }
+                )
             
         except Exception as e:
             logger.error(
@@ -233,7 +247,8 @@ async def aws_cloud_scan(
             )
         
         # Add scan task to background processing
-        logger.info("Adding scan task to background processing", extra={"scan_id": scan_id})
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("Adding scan task to background processing", extra={"scan_id": scan_id})
 
 
         if not scan_id:
@@ -267,7 +282,7 @@ async def aws_cloud_scan(
             scan_id=scan_id,
             message="AWS cloud scan initiated successfully",
             status="IN_PROGRESS",
-            timestamp=datetime.now().isoformat(),
+            timestamp=scan_timestamp,
             tenant_id=str(context.tenant_id)
         )
         
@@ -301,13 +316,14 @@ def _run_aws_scan_sync(
     This runs in a thread pool to prevent blocking the event loop.
     """
     try:
-        logger.info(
-            "Executing AWS scan process in thread pool",
-            extra={
-                "scan_id": scan_id,
-                "thread_name": threading.current_thread().name
-            }
-        )
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug(
+                "Executing AWS scan process in thread pool",
+                extra={
+                    "scan_id": scan_id,
+                    "thread_name": threading.current_thread().name
+                }
+            )
         
         # Execute the actual scan (this is the blocking operation)
         result = process_scan_request_v2(
@@ -405,22 +421,36 @@ async def execute_aws_scan(
         
         # Update scan status to failed using thread pool to avoid blocking
         try:
-            logger.info("Updating scan status to FAILED", extra={"scan_id": scan_id})
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug("Updating scan status to FAILED", extra={"scan_id": scan_id})
             
             def _update_scan_status_to_failed():
                 """Update scan status in database - runs in thread pool"""
                 try:
                     with get_db(application_name='background-scan-error') as db:
-                        scan = db.query(CloudScan).filter(CloudScan.id == uuid.UUID(scan_id)).first()
-                        if scan:
-                            scan.status = "FAILED"
-                            scan.cloud_scan_metadata.update({
-                                "completion_timestamp": datetime.now().isoformat(),
-                                "scan_result": "FAILED",
-                                "error_message": str(e)
-                            })
-                            db.commit()
-                            
+                        # Merge the failure fields into the metadata server-side with
+                        # jsonb `||` instead of loading, mutating and re-sending the blob
+                        result = db.execute(
+                            update(CloudScan)
+                            .where(CloudScan.id == uuid.UUID(scan_id))
+                            .values(
+                                status="FAILED",
+                                cloud_scan_metadata=cast(
+                                    func.coalesce(
+                                        cast(CloudScan.cloud_scan_metadata, JSONB),
+                                        cast({}, JSONB)
+                                    ).op("||")(cast({
+                                        "completion_timestamp": datetime.now().isoformat(),
+                                        "scan_result": "FAILED",
+                                        "error_message": str(e)
+                                    }, JSONB)),
+                                    JSON
+                                )
+                            )
+                        )
+                        db.commit()
+
+                        if result.rowcount:
                             logger.info(
                                 "Scan status updated to FAILED",
                                 extra={
@@ -525,15 +555,16 @@ async def get_service_scan_result(
                 detail=f"Service scan result not found for scan_id: {request.scan_id}, service: {request.service_name}, region: {request.region or 'global'}"
             )
         
-        logger.info(
-            "Service scan result retrieved successfully",
-            extra={
-                "scan_id": request.scan_id,
-                "service_name": request.service_name,
-                "region": request.region,
-                "result_id": str(service_scan_result.id)
-            }
-        )
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug(
+                "Service scan result retrieved successfully",
+                extra={
+                    "scan_id": request.scan_id,
+                    "service_name": request.service_name,
+                    "region": request.region,
+                    "result_id": str(service_scan_result.id)
+                }
+            )
         
         # Convert to response format
         response = ServiceScanResponse(
@@ -617,15 +648,16 @@ async def get_scans(
         # Execute query
         scans = query.all()
         
-        logger.info(
-            "Scans retrieved successfully",
-            extra={
-                "scans_count": len(scans),
-                "tenant_id": str(context.tenant_id),
-                "status": request.status,
-                "cloud_provider": request.cloud_provider
-            }
-        )
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug(
+                "Scans retrieved successfully",
+                extra={
+                    "scans_count": len(scans),
+                    "tenant_id": str(context.tenant_id),
+                    "status": request.status,
+                    "cloud_provider": request.cloud_provider
+                }
+            )
         
         # Convert to response format
         response_scans = []
@@ -648,7 +680,7 @@ async def get_scans(
             "Error retrieving scans",
             extra={
                 "error": str(e),
-                "tenant_id": request.tenant_id,
+                "tenant_id": str(context.tenant_id),
                 "status": request.status,
                 "cloud_provider": request.cloud_provider
             }
@@ -680,7 +712,7 @@ async def get_scan_status(
         HTTPException: If scan is not found or access is denied
     """
     logger.info(
-        "Scan status request received", 
+        "Scan status request received",
         extra={
             "scan_id": scan_id,
             "tenant_id": str(context.tenant_id),
@@ -707,15 +739,16 @@ async def get_scan_status(
                 detail="Scan not found"
             )
         
-        logger.info(
-            "Scan status retrieved successfully",
-            extra={
-                "scan_id": scan_id,
-                "status": scan.status,
-                "tenant_id": scan.tenant_id,
-                "cloud_provider": scan.cloud_provider
-            }
-        )
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug(
+                "Scan status retrieved successfully",
+                extra={
+                    "scan_id": scan_id,
+                    "status": scan.status,
+                    "tenant_id": scan.tenant_id,
+                    "cloud_provider": scan.cloud_provider
+                }
+            )
         
         return {
             "scan_id": str(scan.id),
@@ -765,7 +798,7 @@ async def get_scan(
         HTTPException: If scan is not found or access is denied
     """
     logger.info(
-        "Scan request received", 
+        "Scan request received",
         extra={
             "scan_id": scan_id,
             "tenant_id": str(context.tenant_id),
@@ -799,16 +832,17 @@ async def get_scan(
             ServiceScanResult.tenant_id == context.tenant_id  # Ensure tenant isolation
         ).all()
         
-        logger.info(
-            "Scan retrieved successfully",
-            extra={
-                "scan_id": scan_id,
-                "status": scan.status,
-                "tenant_id": str(scan.tenant_id),
-                "cloud_provider": scan.cloud_provider,
-                "service_results_count": len(service_scan_results)
-            }
-        )
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug(
+                "Scan retrieved successfully",
+                extra={
+                    "scan_id": scan_id,
+                    "status": scan.status,
+                    "tenant_id": str(scan.tenant_id),
+                    "cloud_provider": scan.cloud_provider,
+                    "service_results_count": len(service_scan_results)
+                }
+            )
         
         # Convert service scan results to response format
         service_results = []
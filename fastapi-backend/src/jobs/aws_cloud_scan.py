@@ -1,18 +1,65 @@
 import boto3
+import csv
+import io
 import json
+import logging
+import orjson
+import threading
+import time
 import uuid
 from datetime import datetime
 import traceback
-from typing import Dict, List, Optional, Any
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Dict, Iterable, Iterator, List, Optional, Any
+from botocore.config import Config
 from botocore.exceptions import ClientError, BotoCoreError
+from cachetools import TTLCache
 
 import sys
 import os
 sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
 
+from sqlalchemy import insert
+
 from dbschema.db_connector import get_db
 from dbschema.model import CloudScan, ServiceScanResult, Tenant
 
+# Clients are shared by checks running concurrently, so give each one a
+# connection pool large enough that threads don't queue on botocore's default of 10
+AWS_CLIENT_CONFIG = Config(max_pool_connections=50)
+
+# Per-resource lookups (one call per bucket, key, ...) from every region and
+# every scan in the container share this pool, so nesting it under the region
+# and check pools doesn't multiply the thread count
+RESOURCE_LOOKUP_WORKERS = 32
+_resource_executor = ThreadPoolExecutor(max_workers=RESOURCE_LOOKUP_WORKERS, thread_name_prefix="resource-lookup")
+
+# Enabled regions rarely change, so warm containers reuse the list for an hour
+REGIONS_CACHE_TTL_SECONDS = 3600
+_REGIONS_CACHE: TTLCache = TTLCache(maxsize=256, ttl=REGIONS_CACHE_TTL_SECONDS)
+_regions_cache_lock = threading.Lock()
+
+# One session per container, so botocore's service models and endpoint data are
+# loaded once and shared by every client; sessions aren't safe to create
+# clients from concurrently
+_session = boto3.Session()
+_client_lock = threading.Lock()
+
+# Request the largest page each API allows to cut the number of round-trips
+PAGE_SIZES = {
+    'describe_instances': 1000,
+    'describe_volumes': 500,
+    'describe_security_groups': 1000,
+    'describe_db_instances': 100,
+    'list_keys': 1000,
+    'list_users': 1000,
+    'list_buckets': 10000,
+}
+
+logger = logging.getLogger(__name__)
+
 # Configure basic print statements for Lambda logging
 def log_info(message):
     print(f"INFO: {message}")
@@ -37,6 +84,38 @@ def get_instance_name(tags: Optional[List]) -> str:
             return tag['Value']
     return "Unnamed Instance"
 
+# Rows for the highest-volume resources are slotted dataclasses rather than
+# dicts; orjson serializes them as-is when the results are stored, with field
+# names as the JSON keys
+@dataclass(slots=True)
+class EC2InstanceRow:
+    InstanceId: str
+    InstanceName: str
+    PrivateIpAddress: str
+    PublicIpAddress: str
+    State: str
+    IMDSVersion: str
+
+@dataclass(slots=True)
+class EBSVolumeRow:
+    VolumeId: str
+    VolumeName: str
+    CreateTime: str
+    Size: int
+    State: str
+    Encrypted: bool
+    AttachedInstanceId: Optional[str]
+
+@dataclass(slots=True)
+class SecurityGroupRow:
+    GroupId: str
+    GroupName: str
+    Description: str
+    VpcId: str
+    RiskyInboundRules: List[Dict]
+    InboundRuleCount: int
+    OutboundRuleCount: int
+
 # Non-async functions for EC2 instance checking
 def check_ec2_instances(ec2_client) -> Dict:
     """
@@ -46,18 +125,18 @@ def check_ec2_instances(ec2_client) -> Dict:
     paginator = ec2_client.get_paginator('describe_instances')
     
     try:
-        for page in paginator.paginate():
+        for page in paginator.paginate(PaginationConfig={'PageSize': PAGE_SIZES['describe_instances']}):
             for reservation in page['Reservations']:
                 for instance in reservation['Instances']:
                     instance_name = get_instance_name(instance.get('Tags', []))
-                    instances.append({
-                        'InstanceId': instance['InstanceId'],
-                        'InstanceName': instance_name,
-                        'PrivateIpAddress': instance.get('PrivateIpAddress', 'N/A'),
-                        'PublicIpAddress': instance.get('PublicIpAddress', 'N/A'),
-                        'State': instance['State']['Name'],
-                        'IMDSVersion': 'IMDSv2' if instance.get('MetadataOptions', {}).get('HttpTokens') == 'required' else 'IMDSv1'
-                    })
+                    instances.append(EC2InstanceRow(
+                        InstanceId=instance['InstanceId'],
+                        InstanceName=instance_name,
+                        PrivateIpAddress=instance.get('PrivateIpAddress', 'N/A'),
+                        PublicIpAddress=instance.get('PublicIpAddress', 'N/A'),
+                        State=instance['State']['Name'],
+                        IMDSVersion='IMDSv2' if instance.get('MetadataOptions', {}).get('HttpTokens') == 'required' else 'IMDSv1'
+                    ))
                     
         log_info(f"Successfully retrieved information for {len(instances)} EC2 instances")
         return {'EC2Instances': instances}
@@ -72,18 +151,18 @@ def check_ebs_volumes(ec2_client) -> Dict:
     paginator = ec2_client.get_paginator('describe_volumes')
     
     try:
-        for page in paginator.paginate():
+        for page in paginator.paginate(PaginationConfig={'PageSize': PAGE_SIZES['describe_volumes']}):
             for volume in page['Volumes']:
                 volume_name = get_instance_name(volume.get('Tags', []))
-                volumes.append({
-                    'VolumeId': volume['VolumeId'],
-                    'VolumeName': volume_name,
-                    'CreateTime': volume['CreateTime'].isoformat(),
-                    'Size': volume['Size'],
-                    'State': volume['State'],
-                    'Encrypted': volume['Encrypted'],
-                    'AttachedInstanceId': volume['Attachments'][0]['InstanceId'] if volume['Attachments'] else None
-                })
+                volumes.append(EBSVolumeRow(
+                    VolumeId=volume['VolumeId'],
+                    VolumeName=volume_name,
+                    CreateTime=volume['CreateTime'].isoformat(),
+                    Size=volume['Size'],
+                    State=volume['State'],
+                    Encrypted=volume['Encrypted'],
+                    AttachedInstanceId=volume['Attachments'][0]['InstanceId'] if volume['Attachments'] else None
+                ))
                 
         log_info(f"Successfully retrieved information for {len(volumes)} EBS volumes")
         return {'EBSVolumes': volumes}
@@ -92,51 +171,68 @@ def check_ebs_volumes(ec2_client) -> Dict:
         raise
 
 # Non-async functions for S3 bucket checking
+def inspect_bucket(s3_client, bucket) -> Optional[Dict]:
+    """Fetch the security configuration of a single S3 bucket"""
+    bucket_name = bucket['Name']
+    
+    try:
+        # Get bucket location, unless list_buckets already returned it
+        region = bucket.get('BucketRegion')
+        if not region:
+            location = s3_client.get_bucket_location(Bucket=bucket_name)
+            region = location['LocationConstraint'] or 'us-east-1'
+        
+        # Get bucket versioning
+        versioning = s3_client.get_bucket_versioning(Bucket=bucket_name)
+        versioning_status = versioning.get('Status', 'NotEnabled')
+        
+        # Get bucket encryption
+        try:
+            encryption = s3_client.get_bucket_encryption(Bucket=bucket_name)
+            encryption_enabled = True
+        except ClientError as e:
+            if e.response['Error']['Code'] == 'ServerSideEncryptionConfigurationNotFoundError':
+                encryption_enabled = False
+            else:
+                raise
+        
+        # Get public access block configuration
+        try:
+            public_access_block = s3_client.get_public_access_block(Bucket=bucket_name)
+            public_access_config = public_access_block['PublicAccessBlockConfiguration']
+        except ClientError:
+            public_access_config = "Not configured"
+        
+        return {
+            'BucketName': bucket_name,
+            'CreationDate': bucket['CreationDate'].isoformat(),
+            'Region': region,
+            'VersioningEnabled': versioning_status == 'Enabled',
+            'EncryptionEnabled': encryption_enabled,
+            'PublicAccessBlockConfiguration': public_access_config
+        }
+        
+    except ClientError as e:
+        log_error(f"Error checking bucket {bucket_name}: {str(e)}")
+        return None
+
 def check_s3_buckets(s3_client) -> Dict:
     """Check S3 buckets and their security configurations"""
-    buckets = []
-    
     try:
-        for bucket in s3_client.list_buckets()['Buckets']:
-            try:
-                bucket_name = bucket['Name']
-                
-                # Get bucket location
-                location = s3_client.get_bucket_location(Bucket=bucket_name)
-                region = location['LocationConstraint'] or 'us-east-1'
-                
-                # Get bucket versioning
-                versioning = s3_client.get_bucket_versioning(Bucket=bucket_name)
-                versioning_status = versioning.get('Status', 'NotEnabled')
-                
-                # Get bucket encryption
-                try:
-                    encryption = s3_client.get_bucket_encryption(Bucket=bucket_name)
-                    encryption_enabled = True
-                except ClientError as e:
-                    if e.response['Error']['Code'] == 'ServerSideEncryptionConfigurationNotFoundError':
-                        encryption_enabled = False
-                    else:
-                        raise
-                
-                # Get public access block configuration
-                try:
-                    public_access_block = s3_client.get_public_access_block(Bucket=bucket_name)
-                    public_access_config = public_access_block['PublicAccessBlockConfiguration']
-                except ClientError:
-                    public_access_config = "Not configured"
-                
-                buckets.append({
-                    'BucketName': bucket_name,
-                    'CreationDate': bucket['CreationDate'].isoformat(),
-                    'Region': region,
-                    'VersioningEnabled': versioning_status == 'Enabled',
-                    'EncryptionEnabled': encryption_enabled,
-                    'PublicAccessBlockConfiguration': public_access_config
-                })
-                
-            except ClientError as e:
-                log_error(f"Error checking bucket {bucket_name}: {str(e)}")
+        # Paginating sends MaxBuckets, and S3 only includes BucketRegion
+        # in the listing when the request carries a parameter
+        paginator = s3_client.get_paginator('list_buckets')
+        bucket_list = [
+            bucket
+            for page in paginator.paginate(PaginationConfig={'PageSize': PAGE_SIZES['list_buckets']})
+            for bucket in page['Buckets']
+        ]
+        
+        # Inspect buckets concurrently instead of one round-trip at a time
+        buckets = [
+            bucket for bucket in _resource_executor.map(lambda b: inspect_bucket(s3_client, b), bucket_list)
+            if bucket is not None
+        ]
 
         log_info(f"Successfully retrieved information for {len(buckets)} S3 buckets")
         return {'S3Buckets': buckets}
@@ -150,7 +246,7 @@ def check_security_groups(ec2_client) -> Dict:
     paginator = ec2_client.get_paginator('describe_security_groups')
     
     try:
-        for page in paginator.paginate():
+        for page in paginator.paginate(PaginationConfig={'PageSize': PAGE_SIZES['describe_security_groups']}):
             for sg in page['SecurityGroups']:
                 # Check for problematic inbound rules
                 risky_inbound_rules = []
@@ -163,15 +259,15 @@ def check_security_groups(ec2_client) -> Dict:
                                 'source': '0.0.0.0/0'
                             })
                 
-                security_groups.append({
-                    'GroupId': sg['GroupId'],
-                    'GroupName': sg['GroupName'],
-                    'Description': sg['Description'],
-                    'VpcId': sg.get('VpcId', 'Default'),
-                    'RiskyInboundRules': risky_inbound_rules,
-                    'InboundRuleCount': len(sg.get('IpPermissions', [])),
-                    'OutboundRuleCount': len(sg.get('IpPermissionsEgress', [])),
-                })
+                security_groups.append(SecurityGroupRow(
+                    GroupId=sg['GroupId'],
+                    GroupName=sg['GroupName'],
+                    Description=sg['Description'],
+                    VpcId=sg.get('VpcId', 'Default'),
+                    RiskyInboundRules=risky_inbound_rules,
+                    InboundRuleCount=len(sg.get('IpPermissions', [])),
+                    OutboundRuleCount=len(sg.get('IpPermissionsEgress', [])),
+                ))
                 
         log_info(f"Successfully retrieved information for {len(security_groups)} security groups")
         return {'SecurityGroups': security_groups}
@@ -185,7 +281,7 @@ def check_rds_databases(rds_client) -> Dict:
     paginator = rds_client.get_paginator('describe_db_instances')
     
     try:
-        for page in paginator.paginate():
+        for page in paginator.paginate(PaginationConfig={'PageSize': PAGE_SIZES['describe_db_instances']}):
             for db in page['DBInstances']:
                 databases.append({
                     'DBInstanceId': db['DBInstanceIdentifier'],
@@ -205,41 +301,49 @@ def check_rds_databases(rds_client) -> Dict:
         log_error(f"Error checking RDS databases: {str(e)}")
         raise
 
+def inspect_kms_key(kms_client, key) -> Optional[Dict]:
+    """Fetch details of a single KMS key, or None if it isn't customer managed"""
+    key_id = key['KeyId']
+    try:
+        # Get detailed information about the key
+        key_info = kms_client.describe_key(KeyId=key_id)
+        
+        # Skip keys not managed by the account (AWS managed keys)
+        if key_info['KeyMetadata']['KeyManager'] != 'CUSTOMER':
+            return None
+            
+        # Get key rotation status (only works for customer managed CMKs)
+        try:
+            rotation = kms_client.get_key_rotation_status(KeyId=key_id)
+            key_rotation_enabled = rotation.get('KeyRotationEnabled', False)
+        except ClientError:
+            key_rotation_enabled = "Unable to determine"
+        
+        return {
+            'KeyId': key_id,
+            'KeyArn': key['KeyArn'],
+            'KeyState': key_info['KeyMetadata']['KeyState'],
+            'KeyUsage': key_info['KeyMetadata']['KeyUsage'],
+            'Origin': key_info['KeyMetadata']['Origin'],
+            'RotationEnabled': key_rotation_enabled,
+            'CreationDate': key_info['KeyMetadata']['CreationDate'].isoformat() if 'CreationDate' in key_info['KeyMetadata'] else None
+        }
+    except ClientError as e:
+        log_error(f"Error accessing KMS key {key_id}: {str(e)}")
+        return None
+
 def check_kms_keys(kms_client) -> Dict:
     """Check KMS keys for rotation and usage"""
-    keys = []
     paginator = kms_client.get_paginator('list_keys')
     
     try:
-        for page in paginator.paginate():
-            for key in page['Keys']:
-                key_id = key['KeyId']
-                try:
-                    # Get detailed information about the key
-                    key_info = kms_client.describe_key(KeyId=key_id)
-                    
-                    # Skip keys not managed by the account (AWS managed keys)
-                    if key_info['KeyMetadata']['KeyManager'] != 'CUSTOMER':
-                        continue
-                        
-                    # Get key rotation status (only works for customer managed CMKs)
-                    try:
-                        rotation = kms_client.get_key_rotation_status(KeyId=key_id)
-                        key_rotation_enabled = rotation.get('KeyRotationEnabled', False)
-                    except ClientError:
-                        key_rotation_enabled = "Unable to determine"
-                    
-                    keys.append({
-                        'KeyId': key_id,
-                        'KeyArn': key['KeyArn'],
-                        'KeyState': key_info['KeyMetadata']['KeyState'],
-                        'KeyUsage': key_info['KeyMetadata']['KeyUsage'],
-                        'Origin': key_info['KeyMetadata']['Origin'],
-                        'RotationEnabled': key_rotation_enabled,
-                        'CreationDate': key_info['KeyMetadata']['CreationDate'].isoformat() if 'CreationDate' in key_info['KeyMetadata'] else None
-                    })
-                except ClientError as e:
-                    log_error(f"Error accessing KMS key {key_id}: {str(e)}")
+        # Collect every key first, then fetch per-key details concurrently
+        key_list = [key for page in paginator.paginate(PaginationConfig={'PageSize': PAGE_SIZES['list_keys']}) for key in page['Keys']]
+        
+        keys = [
+            key for key in _resource_executor.map(lambda k: inspect_kms_key(kms_client, k), key_list)
+            if key is not None
+        ]
                 
         log_info(f"Successfully retrieved information for {len(keys)} KMS customer managed keys")
         return {'KMSKeys': keys}
@@ -247,104 +351,213 @@ def check_kms_keys(kms_client) -> Dict:
         log_error(f"Error checking KMS keys: {str(e)}")
         raise
 
+CREDENTIAL_REPORT_ATTEMPTS = 10
+CREDENTIAL_REPORT_POLL_SECONDS = 2
+
+def get_credential_report(iam_client) -> Optional[Dict[str, Dict]]:
+    """
+    Fetch the IAM credential report, which covers MFA and access key status
+    for every user in a single call.
+    
+    Returns:
+        Dict mapping user name to its report row, or None if the report
+        could not be generated or read
+    """
+    try:
+        for _ in range(CREDENTIAL_REPORT_ATTEMPTS):
+            if iam_client.generate_credential_report()['State'] == 'COMPLETE':
+                break
+            time.sleep(CREDENTIAL_REPORT_POLL_SECONDS)
+        else:
+            log_error("Timed out waiting for IAM credential report")
+            return None
+        
+        report = iam_client.get_credential_report()
+    except ClientError as e:
+        log_error(f"Unable to get IAM credential report: {str(e)}")
+        return None
+    
+    rows = csv.DictReader(io.StringIO(report['Content'].decode('utf-8')))
+    return {row['user']: row for row in rows}
+
+# Per-user fallback lookups run concurrently, but IAM throttles its control
+# plane hard, so the request rate across all workers is capped
+IAM_USER_WORKERS = 16
+IAM_REQUESTS_PER_SECOND = 10
+
+class RateLimiter:
+    """Thread-safe limiter that spaces calls evenly at a fixed rate"""
+    def __init__(self, rate: float):
+        self.interval = 1.0 / rate
+        self._next_slot = time.monotonic()
+        self._lock = threading.Lock()
+    
+    def wait(self):
+        with self._lock:
+            now = time.monotonic()
+            delay = self._next_slot - now
+            self._next_slot = max(now, self._next_slot) + self.interval
+        if delay > 0:
+            time.sleep(delay)
+
+def get_user_credential_status(iam_client, user_name, rate_limiter: Optional[RateLimiter] = None):
+    """Look up MFA and active access key count for a single IAM user"""
+    # Check MFA status
+    try:
+        if rate_limiter:
+            rate_limiter.wait()
+        mfa_devices = iam_client.list_mfa_devices(UserName=user_name)
+        has_mfa = len(mfa_devices['MFADevices']) > 0
+    except ClientError as e:
+        log_error(f"Error checking MFA for user {user_name}: {str(e)}")
+        has_mfa = "Unknown"
+    
+    # Check for access keys
+    try:
+        if rate_limiter:
+            rate_limiter.wait()
+        access_keys = iam_client.list_access_keys(UserName=user_name)
+        active_keys = sum(1 for key in access_keys['AccessKeyMetadata'] 
+                         if key['Status'] == 'Active')
+    except ClientError as e:
+        log_error(f"Error checking access keys for user {user_name}: {str(e)}")
+        active_keys = "Unknown"
+    
+    return has_mfa, active_keys
+
 def check_iam_users(iam_client) -> Dict:
     """Check IAM users for security best practices"""
     users = []
     paginator = iam_client.get_paginator('list_users')
     
     try:
-        for page in paginator.paginate():
-            for user in page['Users']:
-                user_name = user['UserName']
-                
-                # Check MFA status
-                try:
-                    mfa_devices = iam_client.list_mfa_devices(UserName=user_name)
-                    has_mfa = len(mfa_devices['MFADevices']) > 0
-                except ClientError as e:
-                    log_error(f"Error checking MFA for user {user_name}: {str(e)}")
-                    has_mfa = "Unknown"
-                
-                # Check for access keys
-                try:
-                    access_keys = iam_client.list_access_keys(UserName=user_name)
-                    active_keys = sum(1 for key in access_keys['AccessKeyMetadata'] 
-                                     if key['Status'] == 'Active')
-                except ClientError as e:
-                    log_error(f"Error checking access keys for user {user_name}: {str(e)}")
-                    active_keys = "Unknown"
-                
-                users.append({
-                    'UserName': user_name,
-                    'UserId': user['UserId'],
-                    'ARN': user['Arn'],
-                    'CreateDate': user['CreateDate'].isoformat(),
-                    'PasswordLastUsed': user.get('PasswordLastUsed', 'Never').isoformat() 
-                                        if user.get('PasswordLastUsed') else 'Never',
-                    'HasMFA': has_mfa,
-                    'ActiveAccessKeys': active_keys,
-                })
-                
+        # One report for all users; per-user lookups are only the fallback
+        # for when it is unavailable or predates a user
+        credential_report = get_credential_report(iam_client) or {}
+        
+        iam_users = [
+            user
+            for page in paginator.paginate(PaginationConfig={'PageSize': PAGE_SIZES['list_users']})
+            for user in page['Users']
+        ]
+        
+        credential_status = {}
+        for user in iam_users:
+            report_row = credential_report.get(user['UserName'])
+            if report_row:
+                credential_status[user['UserName']] = (
+                    report_row['mfa_active'] == 'true',
+                    sum(
+                        1 for column in ('access_key_1_active', 'access_key_2_active')
+                        if report_row[column] == 'true'
+                    ),
+                )
+        
+        missing = [user['UserName'] for user in iam_users if user['UserName'] not in credential_status]
+        if missing:
+            rate_limiter = RateLimiter(IAM_REQUESTS_PER_SECOND)
+            with ThreadPoolExecutor(max_workers=IAM_USER_WORKERS, thread_name_prefix="iam-user") as executor:
+                statuses = executor.map(
+                    lambda user_name: get_user_credential_status(iam_client, user_name, rate_limiter),
+                    missing,
+                )
+                credential_status.update(zip(missing, statuses))
+        
+        for user in iam_users:
+            user_name = user['UserName']
+            has_mfa, active_keys = credential_status[user_name]
+            users.append({
+                'UserName': user_name,
+                'UserId': user['UserId'],
+                'ARN': user['Arn'],
+                'CreateDate': user['CreateDate'].isoformat(),
+                'PasswordLastUsed': user.get('PasswordLastUsed', 'Never').isoformat() 
+                                    if user.get('PasswordLastUsed') else 'Never',
+                'HasMFA': has_mfa,
+                'ActiveAccessKeys': active_keys,
+            })
+            
         log_info(f"Successfully retrieved information for {len(users)} IAM users")
         return {'IAMUsers': users}
     except Exception as e:
         log_error(f"Error checking IAM users: {str(e)}")
         raise
 
+@lru_cache(maxsize=256)
+def _get_client(aws_access_key, aws_secret_key, aws_session_token, region, service):
+    """Get a client per credentials/region/service so its connection pool is reused"""
+    with _client_lock:
+        # Credentials are passed per client (a None session token is ignored)
+        return _session.client(
+            service,
+            region_name=region,
+            aws_access_key_id=aws_access_key,
+            aws_secret_access_key=aws_secret_key,
+            aws_session_token=aws_session_token,
+            config=AWS_CLIENT_CONFIG,
+        )
+
 def initialize_aws_client(aws_access_key, aws_secret_key, region='us-east-1', service='ec2', aws_session_token=None):
     """Initialize a specific AWS service client"""
     try:
-        session_params = {
-            'aws_access_key_id': aws_access_key,
-            'aws_secret_access_key': aws_secret_key,
-            'region_name': region
-        }
-        
-        # Add session token if provided (for temporary credentials)
-        if aws_session_token:
-            session_params['aws_session_token'] = aws_session_token
-            
-        session = boto3.Session(**session_params)
-        return session.client(service)
+        return _get_client(aws_access_key, aws_secret_key, aws_session_token, region, service)
     except Exception as e:
         log_error(f"Failed to initialize AWS {service} client: {str(e)}")
         raise
 
-def scan_region(aws_access_key, aws_secret_key, region, aws_session_token=None):
+def get_regions(aws_access_key, aws_secret_key, aws_session_token=None) -> List[str]:
+    """Get the regions enabled for an account, cached per access key"""
+    with _regions_cache_lock:
+        regions = _REGIONS_CACHE.get(aws_access_key)
+    if regions is not None:
+        return regions
+    
+    ec2_client = initialize_aws_client(aws_access_key, aws_secret_key, service='ec2', aws_session_token=aws_session_token)
+    regions = [region['RegionName'] for region in ec2_client.describe_regions()['Regions']]
+    with _regions_cache_lock:
+        _REGIONS_CACHE[aws_access_key] = regions
+    return regions
+
+def scan_region(aws_access_key, aws_secret_key, region, aws_session_token=None, include_global=False):
     """Scan a single AWS region for resources"""
     log_info(f"Scanning resources in region: {region}")
     
     try:
         # Initialize service clients
         ec2_client = initialize_aws_client(aws_access_key, aws_secret_key, region, 'ec2', aws_session_token)
-        s3_client = initialize_aws_client(aws_access_key, aws_secret_key, region, 's3', aws_session_token)
         rds_client = initialize_aws_client(aws_access_key, aws_secret_key, region, 'rds', aws_session_token)
         kms_client = initialize_aws_client(aws_access_key, aws_secret_key, region, 'kms', aws_session_token)
         
-        # IAM is a global service, so region doesn't matter for IAM client
-        iam_client = initialize_aws_client(aws_access_key, aws_secret_key, 'us-east-1', 'iam', aws_session_token)
+        # Each check talks to an independent API, so run them concurrently
+        checks = {
+            'ec2': (check_ec2_instances, ec2_client),
+            'ebs': (check_ebs_volumes, ec2_client),
+            'security_groups': (check_security_groups, ec2_client),
+            'rds': (check_rds_databases, rds_client),
+            'kms': (check_kms_keys, kms_client),
+        }
         
-        # Run scans sequentially (no async)
-        ec2_results = check_ec2_instances(ec2_client)
-        ebs_results = check_ebs_volumes(ec2_client)
-        s3_results = check_s3_buckets(s3_client)
-        sg_results = check_security_groups(ec2_client)
-        rds_results = check_rds_databases(rds_client)
-        kms_results = check_kms_keys(kms_client)
+        # IAM and S3 listings are global, so only scan them in one region
+        if include_global:
+            # IAM is a global service, so region doesn't matter for IAM client
+            iam_client = initialize_aws_client(aws_access_key, aws_secret_key, 'us-east-1', 'iam', aws_session_token)
+            # list_buckets returns every bucket in the account whatever the region
+            s3_client = initialize_aws_client(aws_access_key, aws_secret_key, region, 's3', aws_session_token)
+            checks['iam'] = (check_iam_users, iam_client)
+            checks['s3'] = (check_s3_buckets, s3_client)
         
-        # Only scan IAM in one region since it's global
-        iam_results = {}
-        if region == 'us-east-1':
-            iam_results = check_iam_users(iam_client)
+        with ThreadPoolExecutor(max_workers=len(checks), thread_name_prefix=f"scan-{region}") as executor:
+            futures = {name: executor.submit(check, client) for name, (check, client) in checks.items()}
+            results = {name: future.result() for name, future in futures.items()}
         
         return {
-            'ec2': ec2_results,
-            'ebs': ebs_results,
-            's3': s3_results,
-            'security_groups': sg_results,
-            'rds': rds_results,
-            'kms': kms_results,
-            'iam': iam_results if region == 'us-east-1' else {'note': 'IAM is a global service scanned in us-east-1 only'},
+            'ec2': results['ec2'],
+            'ebs': results['ebs'],
+            's3': results['s3'] if include_global else {'note': 'S3 buckets are listed account-wide and scanned in one region only'},
+            'security_groups': results['security_groups'],
+            'rds': results['rds'],
+            'kms': results['kms'],
+            'iam': results['iam'] if include_global else {'note': 'IAM is a global service scanned in one region only'},
             'region': region
         }
     except Exception as e:
@@ -354,12 +567,48 @@ def scan_region(aws_access_key, aws_secret_key, region, aws_session_token=None):
             'error': str(e)
         }
 
+def scan_regions(aws_access_key, aws_secret_key, regions, scan_timeout, aws_session_token=None) -> Iterator[Dict]:
+    """
+    Scan all regions concurrently, one worker per region.
+    
+    Yields each region's results as soon as it finishes, so callers can
+    persist them without holding every region in memory. Results are yielded
+    until the scan timeout (minus a 1 minute buffer) is reached; regions
+    still running at that point are dropped.
+    """
+    if not regions:
+        return
+    
+    # IAM and S3 are global; scan them with us-east-1, or the first region if that one is excluded
+    global_region = 'us-east-1' if 'us-east-1' in regions else regions[0]
+    
+    executor = ThreadPoolExecutor(max_workers=len(regions), thread_name_prefix="region-scan")
+    futures = {
+        executor.submit(scan_region, aws_access_key, aws_secret_key, region, aws_session_token, region == global_region)
+        for region in regions
+    }
+    
+    processed = 0
+    try:
+        for future in as_completed(futures, timeout=max(scan_timeout - 60, 0)):  # Leave 1 minute buffer
+            # Drop our reference so the result can be freed once consumed
+            futures.discard(future)
+            result = future.result()
+            processed += 1
+            log_info(f"Scanned region {processed}/{len(regions)}: {result['region']}")
+            yield result
+    except TimeoutError:
+        log_info(f"Approaching timeout limit. Processed {processed}/{len(regions)} regions.")
+    finally:
+        # Don't wait on stragglers; anything not yet started is cancelled
+        executor.shutdown(wait=False, cancel_futures=True)
+
 def extract_credentials(event):
     """Extract AWS credentials from SNS event message"""
     try:
         # Check if this is from SNS
         if 'Records' in event and len(event['Records']) > 0:
-            message = json.loads(event['Records'][0]['Sns']['Message'])
+            message = orjson.loads(event['Records'][0]['Sns']['Message'])
         else:
             # Direct invocation
             message = event
@@ -369,6 +618,7 @@ def extract_credentials(event):
         aws_secret_key = message.get('aws_secret_access_key')
         aws_session_token = message.get('aws_session_token')  # Extract optional session token
         tenant_id = message.get('tenant_id')
+        scan_id = message.get('scan_id')
         
         # Extract optional region exclusion list
         excluded_regions = message.get('excluded_regions', [])
@@ -377,62 +627,76 @@ def extract_credentials(event):
         if not aws_access_key or not aws_secret_key:
             raise ValueError("Missing required AWS credentials in the message")
         
-        return aws_access_key, aws_secret_key, aws_session_token, tenant_id, excluded_regions, scan_options
+        return aws_access_key, aws_secret_key, aws_session_token, tenant_id, scan_id, excluded_regions, scan_options
     except Exception as e:
         log_error(f"Failed to extract credentials: {str(e)}")
         raise
 
-def save_scan_results_to_db(tenant_id, scan_results, scan_id):
-    """Update scan record and save service scan results to database"""
+def save_scan_results_to_db(tenant_id, scan_results: Iterable[Dict], scan_id) -> int:
+    """
+    Save service scan results to database and mark the scan record completed
+    
+    Args:
+        tenant_id: Tenant that owns the scan
+        scan_results: Region results as produced by scan_regions; each region
+            is inserted as it arrives rather than after the whole scan
+        scan_id: Existing CloudScan record to complete
+        
+    Returns:
+        int: Number of regions saved
+    """
     try:
         with get_db(application_name='lambda-save-scan') as db:
             # Fetch the existing cloud scan record by scan_id
             cloud_scan = db.query(CloudScan).filter(CloudScan.id == scan_id).first()
             if not cloud_scan:
                 raise Exception(f"CloudScan record with id {scan_id} not found")
+            
+            # One timestamp for every row in this scan
+            scan_timestamp = datetime.now().isoformat()
+            
+            # Create service scan results, one bulk insert per region. Every
+            # region shares this transaction, so the rows and the COMPLETED
+            # status commit together and a failed scan leaves no partial rows
+            regions_saved = 0
+            for region_results in scan_results:
+                region = region_results['region']
+                service_results = [
+                    {
+                        "id": uuid.uuid4(),
+                        "scan_id": scan_id,
+                        "tenant_id": tenant_id,
+                        "service_name": service_name,
+                        "region": region,
+                        "service_scan_data": service_data,
+                        "scan_result_metadata": {
+                            "timestamp": scan_timestamp,
+                            "service_type": service_name
+                        }
+                    }
+                    for service_name, service_data in region_results.items()
+                    if service_name != 'region'  # Skip the region name entry
+                ]
+                if service_results:
+                    db.execute(insert(ServiceScanResult), service_results)
+                regions_saved += 1
 
             # Update status to COMPLETED
             cloud_scan.status = "COMPLETED"
 
             # Update or merge cloud_scan_metadata
-            existing_metadata = cloud_scan.cloud_scan_metadata or {}
+            existing_metadata = dict(cloud_scan.cloud_scan_metadata or {})
             existing_metadata.update({
-                "total_regions_scanned": 17,
-                "scan_timestamp": datetime.now().isoformat()
+                "total_regions_scanned": regions_saved,
+                "scan_timestamp": scan_timestamp
             })
             cloud_scan.cloud_scan_metadata = existing_metadata
-
-            db.flush()  # Flush to persist changes before adding service results
-
-            
-            
-            # scan_id = cloud_scan.id
-            
-            # Create service scan results
-            for region, region_results in scan_results.items():
-                for service_name, service_data in region_results.items():
-                    if service_name == 'region':
-                        continue  # Skip the region name entry
-                    
-                    service_result = ServiceScanResult(
-                        id=uuid.uuid4(),
-                        scan_id=scan_id,
-                        tenant_id=tenant_id,
-                        service_name=service_name,
-                        region=region,
-                        service_scan_data=service_data,
-                        scan_result_metadata={
-                            "timestamp": datetime.now().isoformat(),
-                            "service_type": service_name
-                        }
-                    )
-                    db.add(service_result)
             
             # Commit all changes
             db.commit()
             log_info(f"Successfully saved scan results to database for scan ID: {scan_id}")
             
-            return scan_id
+            return regions_saved
     except Exception as e:
         log_error(f"Database error while saving scan results: {str(e)}\n{traceback.format_exc()}")
         raise
@@ -440,11 +704,10 @@ def save_scan_results_to_db(tenant_id, scan_results, scan_id):
 def process_scan_request(event):
     try:
         # Extract credentials from the event (updated function)
-        aws_access_key, aws_secret_key, aws_session_token, tenant_id, excluded_regions, scan_options = extract_credentials(event)
+        aws_access_key, aws_secret_key, aws_session_token, tenant_id, scan_id, excluded_regions, scan_options = extract_credentials(event)
         
         # Get list of ALL AWS regions
-        ec2_client = initialize_aws_client(aws_access_key, aws_secret_key, service='ec2', aws_session_token=aws_session_token)
-        all_regions = [region['RegionName'] for region in ec2_client.describe_regions()['Regions']]
+        all_regions = get_regions(aws_access_key, aws_secret_key, aws_session_token)
         
         # Filter out excluded regions if any
         regions = [r for r in all_regions if r not in excluded_regions]
@@ -454,30 +717,17 @@ def process_scan_request(event):
         
         # Add timeout handling for very large accounts
         scan_timeout = scan_options.get('timeout_seconds', 840)  # 14 minutes default for Lambda
-        start_time = datetime.now()
-        
-        # Scan regions one by one
-        scan_results = {}
-        for i, region in enumerate(regions):
-            # Check if we're approaching timeout
-            elapsed = (datetime.now() - start_time).total_seconds()
-            if elapsed > scan_timeout - 60:  # Leave 1 minute buffer
-                log_info(f"Approaching timeout limit. Processed {i}/{len(regions)} regions.")
-                break
-                
-            log_info(f"Scanning region {i+1}/{len(regions)}: {region}")
-            result = scan_region(aws_access_key, aws_secret_key, region, aws_session_token)
-            scan_results[result['region']] = result
         
-        # Save results to database
-        scan_id = save_scan_results_to_db(tenant_id, scan_results)
+        # Scan regions in parallel, saving each region's results as it completes
+        scan_results = scan_regions(aws_access_key, aws_secret_key, regions, scan_timeout, aws_session_token)
+        regions_scanned = save_scan_results_to_db(tenant_id, scan_results, scan_id)
         
         return {
             'statusCode': 200,
             'body': json.dumps({
                 'message': 'Full AWS inventory scan completed successfully',
                 'scan_id': str(scan_id),
-                'regions_scanned': len(scan_results),
+                'regions_scanned': regions_scanned,
                 'total_regions': len(regions),
                 'timestamp': datetime.now().isoformat()
             })
@@ -495,8 +745,7 @@ def process_scan_request(event):
 def process_scan_request_v2(aws_access_key, aws_secret_key, aws_session_token, tenant_id, excluded_regions, scan_id, scan_options: int = 840):
     try:
         # Get list of ALL AWS regions
-        ec2_client = initialize_aws_client(aws_access_key, aws_secret_key, service='ec2', aws_session_token=aws_session_token)
-        all_regions = [region['RegionName'] for region in ec2_client.describe_regions()['Regions']]
+        all_regions = get_regions(aws_access_key, aws_secret_key, aws_session_token)
         
         # Filter out excluded regions if any
         regions = [r for r in all_regions if r not in excluded_regions]
@@ -506,30 +755,17 @@ def process_scan_request_v2(aws_access_key, aws_secret_key, aws_session_token, t
         
         # Add timeout handling for very large accounts
         scan_timeout = scan_options  # scan_options is the timeout in seconds
-        start_time = datetime.now()
-        
-        # Scan regions one by one
-        scan_results = {}
-        for i, region in enumerate(regions):
-            # Check if we're approaching timeout
-            elapsed = (datetime.now() - start_time).total_seconds()
-            if elapsed > scan_timeout - 60:  # Leave 1 minute buffer
-                log_info(f"Approaching timeout limit. Processed {i}/{len(regions)} regions.")
-                break
-                
-            log_info(f"Scanning region {i+1}/{len(regions)}: {region}")
-            result = scan_region(aws_access_key, aws_secret_key, region, aws_session_token)
-            scan_results[result['region']] = result
         
-        # Save results to database
-        scan_id = save_scan_results_to_db(tenant_id, scan_results, scan_id)
+        # Scan regions in parallel, saving each region's results as it completes
+        scan_results = scan_regions(aws_access_key, aws_secret_key, regions, scan_timeout, aws_session_token)
+        regions_scanned = save_scan_results_to_db(tenant_id, scan_results, scan_id)
         
         return {
             'statusCode': 200,
             'body': json.dumps({
                 'message': 'Full AWS inventory scan completed successfully',
                 'scan_id': str(scan_id),
-                'regions_scanned': len(scan_results),
+                'regions_scanned': regions_scanned,
                 'total_regions': len(regions),
                 'timestamp': datetime.now().isoformat()
             })
@@ -541,7 +777,9 @@ def process_scan_request_v2(aws_access_key, aws_secret_key, aws_session_token, t
 def lambda_handler(event, context):
     """Main Lambda handler function"""
     try:
-        print(f"Received event: {json.dumps(event)}")
+        # The event carries AWS credentials and can be large; only dump it when debugging
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("Received event: %s", orjson.dumps(event).decode())
         
         # Check for inventory mode flag
         if event.get('scan_mode') == 'inventory':
@@ -1,22 +1,34 @@
 from fastapi import FastAPI, HTTPException, Depends
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.security import HTTPBearer
+from fastapi.responses import ORJSONResponse
 from contextlib import asynccontextmanager
 import logging
 
 # Import routers
 from .handlers import router
 from .config import settings
+from .services.email import email_service
+from .utils import clear_client_key_cache
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Release long-lived connections and cached client keys on shutdown"""
+    yield
+    await email_service.close()
+    clear_client_key_cache()
+
+
 # Create FastAPI app
 app = FastAPI(
     title="CloudLens Backend API",
     description="Backend API for CloudLens - AWS Cloud Security Scanning Platform",
     version="1.0.0",
+    lifespan=lifespan,
+    default_response_class=ORJSONResponse,
 )
 
 # Add CORS middleware
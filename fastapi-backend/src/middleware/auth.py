@@ -1,17 +1,79 @@
+import copy
+import logging
+import threading
+from cachetools import TTLCache
 from fastapi import HTTPException, status, Depends, Request
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
-from sqlalchemy.orm import Session
+from sqlalchemy import select
+from sqlalchemy.orm import Session, make_transient_to_detached
 from typing import Optional, Tuple
 from dbschema.db_connector import get_db_session
 from dbschema.model import User, Tenant
 from src.utils import verify_token
 
 
-security = HTTPBearer()
+logger = logging.getLogger(__name__)
+
+# Shared so FastAPI parses the header once per request; missing credentials are
+# reported by AuthMiddleware, and optional auth can fall through to anonymous
+security = HTTPBearer(auto_error=False)
+
+# Authenticated users and their tenants are cached briefly so most requests
+# skip the lookup. Entries are column snapshots; each request gets its own
+# instances attached to its session, so handlers can still modify and commit.
+USER_CACHE_TTL_SECONDS = 60
+_user_cache: TTLCache = TTLCache(maxsize=10_000, ttl=USER_CACHE_TTL_SECONDS)
+_user_cache_lock = threading.Lock()
+
+# User and tenant come back in one round-trip; the row is split by position
+_USER_COLUMNS = [column.key for column in User.__table__.columns]
+_TENANT_COLUMNS = [column.key for column in Tenant.__table__.columns]
+_SELECT_USER_WITH_TENANT = select(*User.__table__.columns, *Tenant.__table__.columns).outerjoin(
+    Tenant.__table__, User.tenant_id == Tenant.id
+)
+
+
+def _attach(db: Session, model, snapshot: dict):
+    """Build an instance from a column snapshot and attach it without a query"""
+    # JSON columns (tenant name, metadata, ...) hold dicts and lists; copy them so
+    # a request mutating its instance can't change the cached snapshot others share
+    instance = model(**copy.deepcopy(snapshot))
+    make_transient_to_detached(instance)
+    return db.merge(instance, load=False)
+
+
+def _load_user(db: Session, user_id: str) -> Tuple[Optional[User], Optional[Tenant]]:
+    """Load a user and their tenant by user id, from the cache when fresh"""
+    user_id = str(user_id)
+    with _user_cache_lock:
+        snapshot = _user_cache.get(user_id)
+    
+    if snapshot is None:
+        row = db.execute(_SELECT_USER_WITH_TENANT.where(User.id == user_id)).first()
+        if row is None:
+            return None, None
+        user_snapshot = dict(zip(_USER_COLUMNS, row[:len(_USER_COLUMNS)]))
+        tenant_snapshot = dict(zip(_TENANT_COLUMNS, row[len(_USER_COLUMNS):]))
+        snapshot = (user_snapshot, tenant_snapshot if tenant_snapshot['id'] else None)
+        with _user_cache_lock:
+            _user_cache[user_id] = snapshot
+    
+    user_snapshot, tenant_snapshot = snapshot
+    user = _attach(db, User, user_snapshot)
+    tenant = _attach(db, Tenant, tenant_snapshot) if tenant_snapshot else None
+    return user, tenant
+
+
+def invalidate_user_cache(user_id) -> None:
+    """Drop a cached user and tenant; call after committing changes to that user"""
+    with _user_cache_lock:
+        _user_cache.pop(str(user_id), None)
 
 
 class TenantContext:
     """Context class to hold user and tenant information"""
+    __slots__ = ('user', 'tenant', 'user_id', 'tenant_id')
+
     def __init__(self, user: User, tenant: Tenant):
         self.user = user
         self.tenant = tenant
@@ -24,13 +86,16 @@ class AuthMiddleware:
         self.require_auth = require_auth
         self.require_tenant = require_tenant
     
-    async def __call__(
+    def __call__(
         self,
         credentials: Optional[HTTPAuthorizationCredentials] = Depends(security),
         db: Session = Depends(get_db_session)
     ) -> Optional[TenantContext]:
         """
         Authenticate user and load tenant context
+
+        Declared sync so FastAPI runs it in the threadpool, keeping the
+        blocking session I/O off the event loop
         """
         if not self.require_auth:
             return None
@@ -45,14 +110,12 @@ class AuthMiddleware:
         # Verify the token
         payload = verify_token(credentials.credentials)
         if not payload:
-            print(f"Token verification failed for token: {credentials.credentials[:20]}...")
+            logger.debug("Token verification failed")
             raise HTTPException(
                 status_code=status.HTTP_401_UNAUTHORIZED,
                 detail="Invalid or expired token. Please sign in again.",
                 headers={"WWW-Authenticate": "Bearer"},
             )
-
-        print('payload', payload)
         
         # Get user from database
         user_id = payload.get("sub")
@@ -66,7 +129,7 @@ class AuthMiddleware:
                 headers={"WWW-Authenticate": "Bearer"},
             )
         
-        user = db.query(User).filter(User.id == user_id).first()
+        user, user_tenant = _load_user(db, user_id)
         if not user:
             raise HTTPException(
                 status_code=status.HTTP_401_UNAUTHORIZED,
@@ -83,13 +146,13 @@ class AuthMiddleware:
         # Load tenant context if required
         tenant = None
         if self.require_tenant:
-            if not tenant_id or not user.tenant_id or str(user.tenant_id) != tenant_id:
+            if not tenant_id or not user.tenant_id or user.tenant_id != tenant_id:
                 raise HTTPException(
                     status_code=status.HTTP_403_FORBIDDEN,
                     detail="Invalid tenant association",
                 )
             
-            tenant = db.query(Tenant).filter(Tenant.id == user.tenant_id).first()
+            tenant = user_tenant
             if not tenant:
                 raise HTTPException(
                     status_code=status.HTTP_403_FORBIDDEN,
@@ -99,11 +162,14 @@ class AuthMiddleware:
         return TenantContext(user=user, tenant=tenant) if tenant else user
 
 
-def get_current_context(context: TenantContext = Depends(AuthMiddleware(require_auth=True, require_tenant=True))) -> TenantContext:
+# Shared instance: FastAPI caches dependencies per request by callable identity
+_default_auth = AuthMiddleware(require_auth=True, require_tenant=True)
+
+
+def get_current_context(context: TenantContext = Depends(_default_auth)) -> TenantContext:
     """
     Dependency to get current authenticated user with tenant context
     """
-    print('context', context)
     return context
 
 
@@ -128,17 +194,9 @@ def get_tenant_scoped_context(context: TenantContext = Depends(get_current_conte
     return context.user, context.tenant
 
 
-def get_current_active_user(context: TenantContext = Depends(get_current_context)) -> User:
-    """
-    Dependency to get current active user
-    """
-    user = context.user
-    if not user.is_active:
-        raise HTTPException(
-            status_code=status.HTTP_403_FORBIDDEN,
-            detail="User account is inactive"
-        )
-    return user
+# AuthMiddleware already rejects inactive users, so this is the same dependency;
+# sharing the callable lets FastAPI resolve it once per request
+get_current_active_user = get_current_user
 
 
 def get_current_verified_user(context: TenantContext = Depends(get_current_context)) -> User:
@@ -146,11 +204,6 @@ def get_current_verified_user(context: TenantContext = Depends(get_current_conte
     Dependency to get current verified user
     """
     user = context.user
-    if not user.is_active:
-        raise HTTPException(
-            status_code=status.HTTP_403_FORBIDDEN,
-            detail="User account is inactive"
-        )
     if not user.is_verified:
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
@@ -179,12 +232,12 @@ def get_optional_context(
     if not user_id:
         return None
     
-    user = db.query(User).filter(User.id == user_id).first()
+    user, user_tenant = _load_user(db, user_id)
     if not user or not user.is_active:
         return None
     
     tenant = None
-    if tenant_id and user.tenant_id and str(user.tenant_id) == tenant_id:
-        tenant = db.query(Tenant).filter(Tenant.id == user.tenant_id).first()
+    if tenant_id and user.tenant_id and user.tenant_id == tenant_id:
+        tenant = user_tenant
     
     return TenantContext(user=user, tenant=tenant) if tenant else None 
\ No newline at end of file
@@ -1,26 +1,41 @@
-from pydantic import BaseModel, EmailStr, Field, validator
+import re
+from pydantic import BaseModel, ConfigDict, EmailStr, Field, field_validator
 from typing import Optional
 from datetime import datetime
 from uuid import UUID
 
 
+# Accepts most valid passwords in a single compiled match
+_STRONG_PASSWORD_RE = re.compile(r'(?=.*[A-Z])(?=.*[a-z])(?=.*\d).{8,}', re.DOTALL)
+
+
+def validate_password_strength(v: str, label: str = 'Password') -> str:
+    """Require 8+ characters with an uppercase letter, a lowercase letter and a digit"""
+    if _STRONG_PASSWORD_RE.match(v):
+        return v
+    
+    # Slow path: find which rule failed (and accept non-ASCII letters the regex doesn't cover)
+    if len(v) < 8:
+        raise ValueError(f'{label} must be at least 8 characters long')
+    if not any(c.isupper() for c in v):
+        raise ValueError(f'{label} must contain at least one uppercase letter')
+    if not any(c.islower() for c in v):
+        raise ValueError(f'{label} must contain at least one lowercase letter')
+    if not any(c.isdigit() for c in v):
+        raise ValueError(f'{label} must contain at least one digit')
+    return v
+
+
 class UserSignUpRequest(BaseModel):
     email: EmailStr = Field(..., description="User's email address")
     password: str = Field(..., min_length=8, description="User's password (minimum 8 characters)")
     first_name: str = Field(..., min_length=1, max_length=100, description="User's first name")
     last_name: str = Field(..., min_length=1, max_length=100, description="User's last name")
     
-    @validator('password')
-    def validate_password(cls, v):
-        if len(v) < 8:
-            raise ValueError('Password must be at least 8 characters long')
-        if not any(c.isupper() for c in v):
-            raise ValueError('Password must contain at least one uppercase letter')
-        if not any(c.islower() for c in v):
-            raise ValueError('Password must contain at least one lowercase letter')
-        if not any(c.isdigit() for c in v):
-            raise ValueError('Password must contain at least one digit')
-        return v
+    @field_validator('password')
+    @classmethod
+    def validate_password(cls, v: str) -> str:
+        return validate_password_strength(v)
 
 
 class UserSignInRequest(BaseModel):
@@ -41,8 +56,7 @@ class UserResponse(BaseModel):
     last_login: Optional[datetime] = None
     tenant_id: Optional[UUID] = None
     
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True)
 
 
 class TokenResponse(BaseModel):
@@ -77,17 +91,10 @@ class PasswordChangeRequest(BaseModel):
     current_password: str = Field(..., description="Current password")
     new_password: str = Field(..., min_length=8, description="New password (minimum 8 characters)")
     
-    @validator('new_password')
-    def validate_new_password(cls, v):
-        if len(v) < 8:
-            raise ValueError('New password must be at least 8 characters long')
-        if not any(c.isupper() for c in v):
-            raise ValueError('New password must contain at least one uppercase letter')
-        if not any(c.islower() for c in v):
-            raise ValueError('New password must contain at least one lowercase letter')
-        if not any(c.isdigit() for c in v):
-            raise ValueError('New password must contain at least one digit')
-        return v
+    @field_validator('new_password')
+    @classmethod
+    def validate_new_password(cls, v: str) -> str:
+        return validate_password_strength(v, 'New password')
 
 
 class ForgotPasswordRequest(BaseModel):
@@ -98,17 +105,10 @@ class ResetPasswordRequest(BaseModel):
     token: str = Field(..., description="Password reset token")
     new_password: str = Field(..., min_length=8, description="New password (minimum 8 characters)")
     
-    @validator('new_password')
-    def validate_new_password(cls, v):
-        if len(v) < 8:
-            raise ValueError('New password must be at least 8 characters long')
-        if not any(c.isupper() for c in v):
-            raise ValueError('New password must contain at least one uppercase letter')
-        if not any(c.islower() for c in v):
-            raise ValueError('New password must contain at least one lowercase letter')
-        if not any(c.isdigit() for c in v):
-            raise ValueError('New password must contain at least one digit')
-        return v
+    @field_validator('new_password')
+    @classmethod
+    def validate_new_password(cls, v: str) -> str:
+        return validate_password_strength(v, 'New password')
 
 
 class RefreshTokenRequest(BaseModel):
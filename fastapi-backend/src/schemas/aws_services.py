@@ -1,5 +1,5 @@
 from datetime import datetime
-from typing import List, Optional, Dict, Any, Union
+from typing import List, Optional, Union
 from pydantic import BaseModel, Field
 from enum import Enum
 
@@ -53,6 +53,10 @@ class PublicAccessBlockConfiguration(BaseModel):
     RestrictPublicBuckets: bool = Field(..., description="Restrict public buckets")
 
 
+# The S3Bucket field of the same name would shadow the class inside its body
+_PublicAccessBlockConfiguration = PublicAccessBlockConfiguration
+
+
 class S3Bucket(BaseModel):
     """S3 Bucket schema based on real AWS scan data"""
     Region: str = Field(..., description="AWS region where bucket is located")
@@ -60,7 +64,7 @@ class S3Bucket(BaseModel):
     CreationDate: datetime = Field(..., description="When the bucket was created")
     EncryptionEnabled: bool = Field(..., description="Whether the bucket has encryption enabled")
     VersioningEnabled: bool = Field(..., description="Whether versioning is enabled")
-    PublicAccessBlockConfiguration: Union[PublicAccessBlockConfiguration, str] = Field(
+    PublicAccessBlockConfiguration: Union[_PublicAccessBlockConfiguration, str] = Field(
         ..., description="Public access block configuration or 'Not configured'"
     )
 
@@ -94,6 +98,19 @@ class KMSKey(BaseModel):
     RotationEnabled: bool = Field(..., description="Whether key rotation is enabled")
 
 
+class RDSDatabase(BaseModel):
+    """RDS database instance schema based on real AWS scan data"""
+    DBInstanceId: str = Field(..., description="RDS database instance identifier")
+    Engine: str = Field(..., description="Database engine")
+    EngineVersion: str = Field(..., description="Database engine version")
+    StorageEncrypted: bool = Field(..., description="Whether storage is encrypted")
+    PubliclyAccessible: bool = Field(..., description="Whether the instance is publicly accessible")
+    MultiAZ: bool = Field(..., description="Whether the instance is deployed across multiple AZs")
+    DeletionProtection: bool = Field(..., description="Whether deletion protection is enabled")
+    BackupRetentionPeriod: int = Field(..., description="Automated backup retention in days")
+    VpcId: str = Field(..., description="VPC ID of the DB subnet group or 'N/A'")
+
+
 # Container classes for scan results
 class EBSVolumesScanResult(BaseModel):
     """EBS volumes scan result"""
@@ -122,7 +139,7 @@ class KMSKeysScanResult(BaseModel):
 
 class RDSDatabasesScanResult(BaseModel):
     """RDS databases scan result"""
-    RDSDatabases: List[Dict[str, Any]] = Field(default_factory=list, description="List of RDS databases")
+    RDSDatabases: List[RDSDatabase] = Field(default_factory=list, description="List of RDS databases")
 
 
 # Complete scan result that can contain any combination of services
@@ -133,7 +150,7 @@ class AWSServicesScanResult(BaseModel):
     S3Buckets: Optional[List[S3Bucket]] = Field(None, description="S3 buckets")
     SecurityGroups: Optional[List[SecurityGroup]] = Field(None, description="Security groups")
     KMSKeys: Optional[List[KMSKey]] = Field(None, description="KMS keys")
-    RDSDatabases: Optional[List[Dict[str, Any]]] = Field(None, description="RDS databases")
+    RDSDatabases: Optional[List[RDSDatabase]] = Field(None, description="RDS databases")
     
     # Metadata
     scan_timestamp: Optional[datetime] = Field(None, description="When the scan was performed")
@@ -58,6 +58,23 @@ class TopResource(BaseModel):
     status: str
 
 
+class ScanHistoryItem(BaseModel):
+    scan_id: str
+    name: Optional[str] = None
+    status: Optional[str] = None
+    created_at: Optional[str] = None
+    cloud_provider: Optional[str] = None
+    metadata: Optional[Dict[str, Any]] = None
+
+
+class Alert(BaseModel):
+    type: str
+    severity: str
+    message: str
+    resource: str
+    region: str
+
+
 class DashboardResponse(BaseModel):
     scan_overview: ScanOverview
     service_metrics: List[ServiceMetrics]
@@ -65,5 +82,5 @@ class DashboardResponse(BaseModel):
     security_metrics: SecurityMetrics
     resource_trends: List[ResourceTrend]
     top_resources: List[TopResource]
-    scan_history: List[Dict[str, Any]]
-    alerts: List[Dict[str, Any]] 
\ No newline at end of file
+    scan_history: List[ScanHistoryItem]
+    alerts: List[Alert] 
\ No newline at end of file
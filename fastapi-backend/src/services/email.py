@@ -2,14 +2,138 @@
 Email service for sending password reset and other notification emails
 """
 import aiosmtplib
+import asyncio
+import datetime
 import logging
 from email.message import EmailMessage
 from typing import Optional
-from jinja2 import Template
+from jinja2 import Environment
+from markupsafe import escape
 from ..config import settings
 
 logger = logging.getLogger(__name__)
 
+RESET_PASSWORD_HTML = """
+<!DOCTYPE html>
+<html>
+<head>
+    <meta charset="utf-8">
+    <meta name="viewport" content="width=device-width, initial-scale=1.0">
+    <title>Password Reset - CloudLens</title>
+    <style>
+        body { font-family: -apple-system, BlinkMacSystemFont, 'Segoe UI', Roboto, sans-serif; margin: 0; padding: 0; background-color: #f5f5f5; }
+        .container { max-width: 600px; margin: 0 auto; background: white; padding: 40px; border-radius: 8px; margin-top: 40px; }
+        .header { text-align: center; margin-bottom: 40px; }
+        .logo { font-size: 24px; font-weight: bold; color: #2563eb; }
+        .content { line-height: 1.6; color: #374151; }
+        .button { display: inline-block; padding: 12px 24px; background: #2563eb; color: white; text-decoration: none; border-radius: 6px; font-weight: 500; margin: 20px 0; }
+        .footer { margin-top: 40px; padding-top: 20px; border-top: 1px solid #e5e7eb; font-size: 14px; color: #6b7280; }
+        .warning { background: #fef3c7; padding: 16px; border-radius: 6px; margin: 20px 0; border-left: 4px solid #f59e0b; }
+    </style>
+</head>
+<body>
+    <div class="container">
+        <div class="header">
+            <div class="logo">☁️ CloudLens</div>
+        </div>
+
+        <div class="content">
+            <h2>Reset Your Password</h2>
+
+            <p>Hello {{ user_name }},</p>
+
+            <p>We received a request to reset the password for your CloudLens account associated with this email address.</p>
+
+            <p>To reset your password, click the button below:</p>
+
+            <div style="text-align: center;">
+                <a href="{{ reset_url }}" class="button">Reset Password</a>
+            </div>
+
+            <div class="warning">
+                <strong>Security Notice:</strong><br>
+                • This link will expire in {{ expire_hours }} hour(s)<br>
+                • If you didn't request this, you can safely ignore this email<br>
+                • Never share this link with anyone
+            </div>
+
+            <p>If the button doesn't work, you can also copy and paste this link into your browser:</p>
+            <p style="word-break: break-all; color: #6b7280; font-size: 14px;">{{ reset_url }}</p>
+
+            <p>If you didn't request a password reset, please ignore this email or contact our support team if you have concerns.</p>
+        </div>
+
+        <div class="footer">
+            <p>This email was sent by CloudLens. If you have questions, please contact our support team.</p>
+            <p>© {{ current_year }} CloudLens. All rights reserved.</p>
+        </div>
+    </div>
+</body>
+</html>
+"""
+
+WELCOME_HTML = """
+<!DOCTYPE html>
+<html>
+<head>
+    <meta charset="utf-8">
+    <title>Welcome to CloudLens</title>
+    <style>
+        body { font-family: -apple-system, BlinkMacSystemFont, 'Segoe UI', Roboto, sans-serif; margin: 0; padding: 0; background-color: #f5f5f5; }
+        .container { max-width: 600px; margin: 0 auto; background: white; padding: 40px; border-radius: 8px; margin-top: 40px; }
+        .header { text-align: center; margin-bottom: 40px; }
+        .logo { font-size: 24px; font-weight: bold; color: #2563eb; }
+        .content { line-height: 1.6; color: #374151; }
+        .button { display: inline-block; padding: 12px 24px; background: #2563eb; color: white; text-decoration: none; border-radius: 6px; font-weight: 500; margin: 20px 0; }
+    </style>
+</head>
+<body>
+    <div class="container">
+        <div class="header">
+            <div class="logo">☁️ CloudLens</div>
+        </div>
+
+        <div class="content">
+            <h2>Welcome to CloudLens!</h2>
+
+            <p>Hello {{ user_name }},</p>
+
+            <p>Thank you for joining CloudLens! We're excited to help you secure your cloud infrastructure.</p>
+
+            <p>Get started by:</p>
+            <ul>
+                <li>Setting up your AWS credentials</li>
+                <li>Running your first security scan</li>
+                <li>Exploring your security dashboard</li>
+            </ul>
+
+            <div style="text-align: center;">
+                <a href="{{ dashboard_url }}" class="button">Get Started</a>
+            </div>
+
+            <p>If you have any questions, our documentation and support team are here to help.</p>
+
+            <p>Welcome aboard!</p>
+            <p>The CloudLens Team</p>
+        </div>
+    </div>
+</body>
+</html>
+"""
+
+# Templates are parsed and compiled once; each send only renders
+_template_env = Environment(autoescape=True)
+_RESET_PASSWORD_TEMPLATE = _template_env.from_string(RESET_PASSWORD_HTML)
+_WELCOME_TEMPLATE = _template_env.from_string(WELCOME_HTML)
+
+# The welcome email only varies by user name, so it is rendered once around a
+# placeholder and each send just joins in the escaped name
+_USER_NAME_PLACEHOLDER = "\x00user_name\x00"
+_WELCOME_HTML_PARTS = _WELCOME_TEMPLATE.render(
+    user_name=_USER_NAME_PLACEHOLDER,
+    dashboard_url=f"{settings.password_reset_base_url}/dashboard"
+).split(_USER_NAME_PLACEHOLDER)
+
 
 class EmailService:
     """SMTP email service for open source deployments"""
@@ -22,6 +146,34 @@ class EmailService:
         self.from_email = settings.smtp_from_email or settings.smtp_user
         self.from_name = settings.smtp_from_name
         self.use_tls = settings.smtp_use_tls
+        
+        # One long-lived SMTP connection, opened on first send; SMTP handles a
+        # single transaction at a time, so sends are serialized on the lock
+        self._client: Optional[aiosmtplib.SMTP] = None
+        self._client_lock = asyncio.Lock()
+
+    async def _get_client(self) -> aiosmtplib.SMTP:
+        """Return the connected SMTP client, connecting and logging in if needed"""
+        if self._client is None or not self._client.is_connected:
+            self._client = aiosmtplib.SMTP(
+                hostname=self.smtp_host,
+                port=self.smtp_port,
+                username=self.smtp_user,
+                password=self.smtp_password,
+                use_tls=self.use_tls,
+            )
+            await self._client.connect()
+        return self._client
+
+    async def close(self) -> None:
+        """Close the SMTP connection, if open"""
+        async with self._client_lock:
+            if self._client is not None and self._client.is_connected:
+                try:
+                    await self._client.quit()
+                except aiosmtplib.SMTPException as e:
+                    logger.warning(f"Error closing SMTP connection: {str(e)}")
+            self._client = None
 
     async def _send_email(
         self,
@@ -50,15 +202,16 @@ class EmailService:
             else:
                 message.set_content(html_content, subtype='html')
 
-            # Send email
-            await aiosmtplib.send(
-                message,
-                hostname=self.smtp_host,
-                port=self.smtp_port,
-                username=self.smtp_user,
-                password=self.smtp_password,
-                use_tls=self.use_tls,
-            )
+            # Send email over the shared connection, reconnecting once if the
+            # server dropped it while idle
+            async with self._client_lock:
+                client = await self._get_client()
+                try:
+                    await client.send_message(message)
+                except aiosmtplib.SMTPServerDisconnected:
+                    self._client = None
+                    client = await self._get_client()
+                    await client.send_message(message)
             
             logger.info(f"Email sent successfully to {to_email}")
             return True
@@ -77,66 +230,6 @@ class EmailService:
         
         reset_url = f"{settings.password_reset_base_url}/reset-password?token={reset_token}"
         
-        # HTML email template
-        html_template = Template("""
-        <!DOCTYPE html>
-        <html>
-        <head>
-            <meta charset="utf-8">
-            <meta name="viewport" content="width=device-width, initial-scale=1.0">
-            <title>Password Reset - CloudLens</title>
-            <style>
-                body { font-family: -apple-system, BlinkMacSystemFont, 'Segoe UI', Roboto, sans-serif; margin: 0; padding: 0; background-color: #f5f5f5; }
-                .container { max-width: 600px; margin: 0 auto; background: white; padding: 40px; border-radius: 8px; margin-top: 40px; }
-                .header { text-align: center; margin-bottom: 40px; }
-                .logo { font-size: 24px; font-weight: bold; color: #2563eb; }
-                .content { line-height: 1.6; color: #374151; }
-                .button { display: inline-block; padding: 12px 24px; background: #2563eb; color: white; text-decoration: none; border-radius: 6px; font-weight: 500; margin: 20px 0; }
-                .footer { margin-top: 40px; padding-top: 20px; border-top: 1px solid #e5e7eb; font-size: 14px; color: #6b7280; }
-                .warning { background: #fef3c7; padding: 16px; border-radius: 6px; margin: 20px 0; border-left: 4px solid #f59e0b; }
-            </style>
-        </head>
-        <body>
-            <div class="container">
-                <div class="header">
-                    <div class="logo">☁️ CloudLens</div>
-                </div>
-                
-                <div class="content">
-                    <h2>Reset Your Password</h2>
-                    
-                    <p>Hello {{ user_name }},</p>
-                    
-                    <p>We received a request to reset the password for your CloudLens account associated with this email address.</p>
-                    
-                    <p>To reset your password, click the button below:</p>
-                    
-                    <div style="text-align: center;">
-                        <a href="{{ reset_url }}" class="button">Reset Password</a>
-                    </div>
-                    
-                    <div class="warning">
-                        <strong>Security Notice:</strong><br>
-                        • This link will expire in {{ expire_hours }} hour(s)<br>
-                        • If you didn't request this, you can safely ignore this email<br>
-                        • Never share this link with anyone
-                    </div>
-                    
-                    <p>If the button doesn't work, you can also copy and paste this link into your browser:</p>
-                    <p style="word-break: break-all; color: #6b7280; font-size: 14px;">{{ reset_url }}</p>
-                    
-                    <p>If you didn't request a password reset, please ignore this email or contact our support team if you have concerns.</p>
-                </div>
-                
-                <div class="footer">
-                    <p>This email was sent by CloudLens. If you have questions, please contact our support team.</p>
-                    <p>© {{ current_year }} CloudLens. All rights reserved.</p>
-                </div>
-            </div>
-        </body>
-        </html>
-                """)
-        
         # Text version for email clients that don't support HTML
         text_content = f"""
             CloudLens - Password Reset
@@ -159,14 +252,11 @@ class EmailService:
             © 2025 CloudLens. All rights reserved.
         """
         
-        import datetime
-        current_year = datetime.datetime.now().year
-        
-        html_content = html_template.render(
+        html_content = _RESET_PASSWORD_TEMPLATE.render(
             user_name=user_name,
             reset_url=reset_url,
             expire_hours=settings.password_reset_token_expire_hours,
-            current_year=current_year
+            current_year=datetime.datetime.now().year
         )
         
         return await self._send_email(
@@ -183,54 +273,7 @@ class EmailService:
     ) -> bool:
         """Send welcome email to new users"""
         
-        html_content = f"""
-        <!DOCTYPE html>
-        <html>
-        <head>
-            <meta charset="utf-8">
-            <title>Welcome to CloudLens</title>
-            <style>
-                body {{ font-family: -apple-system, BlinkMacSystemFont, 'Segoe UI', Roboto, sans-serif; margin: 0; padding: 0; background-color: #f5f5f5; }}
-                .container {{ max-width: 600px; margin: 0 auto; background: white; padding: 40px; border-radius: 8px; margin-top: 40px; }}
-                .header {{ text-align: center; margin-bottom: 40px; }}
-                .logo {{ font-size: 24px; font-weight: bold; color: #2563eb; }}
-                .content {{ line-height: 1.6; color: #374151; }}
-                .button {{ display: inline-block; padding: 12px 24px; background: #2563eb; color: white; text-decoration: none; border-radius: 6px; font-weight: 500; margin: 20px 0; }}
-            </style>
-        </head>
-        <body>
-            <div class="container">
-                <div class="header">
-                    <div class="logo">☁️ CloudLens</div>
-                </div>
-                
-                <div class="content">
-                    <h2>Welcome to CloudLens!</h2>
-                    
-                    <p>Hello {user_name},</p>
-                    
-                    <p>Thank you for joining CloudLens! We're excited to help you secure your cloud infrastructure.</p>
-                    
-                    <p>Get started by:</p>
-                    <ul>
-                        <li>Setting up your AWS credentials</li>
-                        <li>Running your first security scan</li>
-                        <li>Exploring your security dashboard</li>
-                    </ul>
-                    
-                    <div style="text-align: center;">
-                        <a href="{settings.password_reset_base_url}/dashboard" class="button">Get Started</a>
-                    </div>
-                    
-                    <p>If you have any questions, our documentation and support team are here to help.</p>
-                    
-                    <p>Welcome aboard!</p>
-                    <p>The CloudLens Team</p>
-                </div>
-            </div>
-        </body>
-        </html>
-        """
+        html_content = str(escape(user_name)).join(_WELCOME_HTML_PARTS)
         
         return await self._send_email(
             to_email=to_email,
@@ -3,73 +3,130 @@
 Utility functions for CloudLens Backend
 """
 
-from cryptography.fernet import Fernet
+import asyncio
 import base64
-import json
-from typing import Dict, Any, Optional
-from cryptography.hazmat.primitives import hashes
-from cryptography.hazmat.primitives.kdf.pbkdf2 import PBKDF2HMAC
+import orjson
+from typing import TYPE_CHECKING, Dict, List, Optional, TypedDict
 import secrets
-import hashlib
+import logging
+import threading
+import time
+import uuid
 import bcrypt
-from passlib.context import CryptContext
-from datetime import datetime, timedelta
-from typing import Optional
+from cachetools import LRUCache, TLRUCache
+from datetime import timedelta
 import jwt
 from .config import settings
 
-# Password hashing context
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+# Fernet and the KDFs are only needed by the key and client-encryption helpers,
+# which the API itself never calls; they are imported where used
+if TYPE_CHECKING:
+    from cryptography.fernet import Fernet
+
+logger = logging.getLogger(__name__)
+
+# Settings are fixed for the life of the process, so the signing key is
+# encoded once rather than by PyJWT on every call
+_JWT_SECRET_BYTES = settings.jwt_secret.encode("utf-8")
+_JWT_ALGORITHM = settings.jwt_algorithm
+_JWT_ALGORITHMS = [settings.jwt_algorithm]
+
+# bcrypt only uses the first 72 bytes of a password; longer input is truncated
+# the same way passlib did, so existing hashes keep verifying
+BCRYPT_MAX_PASSWORD_BYTES = 72
 
 def hash_password(password: str) -> str:
     """Hash a password using bcrypt"""
-    return pwd_context.hash(password)
+    salt = bcrypt.gensalt(rounds=settings.bcrypt_rounds)
+    return bcrypt.hashpw(password.encode()[:BCRYPT_MAX_PASSWORD_BYTES], salt).decode()
 
 def verify_password(plain_password: str, hashed_password: str) -> bool:
     """Verify a password against its hash"""
-    return pwd_context.verify(plain_password, hashed_password)
+    if not hashed_password:
+        return False
+    try:
+        return bcrypt.checkpw(plain_password.encode()[:BCRYPT_MAX_PASSWORD_BYTES], hashed_password.encode())
+    except ValueError:
+        # Not a bcrypt hash
+        return False
+
+async def hash_password_async(password: str) -> str:
+    """
+    Hash a password in a worker thread so the event loop stays free; bcrypt
+    releases the GIL, so concurrent hashes run in parallel across cores.
+    """
+    return await asyncio.to_thread(hash_password, password)
+
+async def verify_password_async(plain_password: str, hashed_password: str) -> bool:
+    """Verify a password in a worker thread so the event loop stays free"""
+    return await asyncio.to_thread(verify_password, plain_password, hashed_password)
 
 def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -> str:
     """Create a JWT access token"""
     to_encode = data.copy()
-    if expires_delta:
-        expire = datetime.utcnow() + expires_delta
-    else:
-        expire = datetime.utcnow() + timedelta(hours=24)
+    lifetime = expires_delta.total_seconds() if expires_delta else 24 * 3600
     
-    to_encode.update({"exp": expire})
-    encoded_jwt = jwt.encode(to_encode, settings.jwt_secret, algorithm=settings.jwt_algorithm)
+    # exp is an integer epoch claim, so it is computed without datetime objects
+    to_encode.update({"exp": int(time.time() + lifetime)})
+    encoded_jwt = jwt.encode(to_encode, _JWT_SECRET_BYTES, algorithm=_JWT_ALGORITHM)
     return encoded_jwt
 
 def create_refresh_token(data: dict) -> str:
     """Create a JWT refresh token with longer expiration"""
     to_encode = data.copy()
-    expire = datetime.utcnow() + timedelta(days=30)
-    to_encode.update({"exp": expire})
-    encoded_jwt = jwt.encode(to_encode, settings.jwt_secret, algorithm=settings.jwt_algorithm)
+    to_encode.update({"exp": int(time.time()) + 30 * 24 * 3600})
+    encoded_jwt = jwt.encode(to_encode, _JWT_SECRET_BYTES, algorithm=_JWT_ALGORITHM)
     return encoded_jwt
 
+# Decoded tokens are cached until their own expiry, so repeat requests with the
+# same token skip signature verification
+_token_cache: TLRUCache = TLRUCache(
+    maxsize=10_000,
+    ttu=lambda token, payload, now: payload.get("exp", now),
+    timer=time.time,
+)
+_token_cache_lock = threading.Lock()
+
 def verify_token(token: str) -> Optional[dict]:
-    """Verify and decode a JWT token"""
+    """Verify and decode a JWT token; tenant_id is returned as a UUID"""
+    with _token_cache_lock:
+        payload = _token_cache.get(token)
+    if payload is not None:
+        return dict(payload)
+    
+    payload = _decode_token(token)
+    if payload is not None:
+        # Parsed once per token so callers compare against UUID columns directly
+        tenant_id = payload.get("tenant_id")
+        if isinstance(tenant_id, str):
+            try:
+                payload["tenant_id"] = uuid.UUID(tenant_id)
+            except ValueError:
+                payload["tenant_id"] = None
+        with _token_cache_lock:
+            _token_cache[token] = payload
+        return dict(payload)
+    return None
+
+def _decode_token(token: str) -> Optional[dict]:
+    """Decode a JWT token, verifying its signature and expiry"""
     try:
-        print(f"JWT Secret being used: {settings.jwt_secret[:10]}...") # Only print first 10 chars for security
-        print(f"JWT Algorithm: {settings.jwt_algorithm}")
-        payload = jwt.decode(token, settings.jwt_secret, algorithms=[settings.jwt_algorithm])
+        payload = jwt.decode(token, _JWT_SECRET_BYTES, algorithms=_JWT_ALGORITHMS)
         return payload
     except jwt.ExpiredSignatureError as e:
-        print(f"Token expired: {e}")
+        logger.debug("Token expired: %s", e)
         return None
     except jwt.InvalidTokenError as e:
-        print(f"Invalid token error: {e}")
+        logger.debug("Invalid token error: %s", e)
         return None
     except Exception as e:
         # Log the error for debugging
-        print(f"Token verification error: {e}")
+        logger.debug("Token verification error: %s", e)
         return None
 
 def generate_reset_token(user_id: str) -> str:
     """Generate a password reset token"""
-    expire = datetime.utcnow() + timedelta(hours=settings.password_reset_token_expire_hours)
+    expire = int(time.time()) + settings.password_reset_token_expire_hours * 3600
     to_encode = {
         "sub": user_id,
         "exp": expire,
@@ -77,8 +134,8 @@ def generate_reset_token(user_id: str) -> str:
     }
     encoded_jwt = jwt.encode(
         to_encode, 
-        settings.jwt_secret, 
-        algorithm=settings.jwt_algorithm
+        _JWT_SECRET_BYTES, 
+        algorithm=_JWT_ALGORITHM
     )
     return encoded_jwt
 
@@ -88,8 +145,8 @@ def verify_reset_token(token: str) -> Optional[str]:
     try:
         payload = jwt.decode(
             token,
-            settings.jwt_secret,
-            algorithms=[settings.jwt_algorithm]
+            _JWT_SECRET_BYTES,
+            algorithms=_JWT_ALGORITHMS
         )
         
         if payload.get("type") != "password_reset":
@@ -103,17 +160,87 @@ def verify_reset_token(token: str) -> Optional[str]:
         return None
 
 
-def generate_encryption_key():
-    """Generate a new encryption key for AWS credentials"""
-    key = Fernet.generate_key()
-    print(f"Generated encryption key: {key.decode()}")
-    return key.decode()
+def generate_encryption_key() -> str:
+    """Generate a new encryption key for AWS credentials (a Fernet key)"""
+    return generate_encryption_keys(1)[0]
+
+def generate_encryption_keys(count: int) -> list[str]:
+    """Generate several encryption keys from a single read of the OS random source"""
+    random_bytes = secrets.token_bytes(32 * count)
+    return [
+        base64.urlsafe_b64encode(random_bytes[i:i + 32]).decode()
+        for i in range(0, 32 * count, 32)
+    ]
 
-def generate_jwt_secret():
+def generate_jwt_secret() -> str:
     """Generate a random JWT secret key"""
-    secret = base64.urlsafe_b64encode(secrets.token_bytes(32)).decode()
-    print(f"Generated JWT secret: {secret}")
-    return secret
+    return base64.urlsafe_b64encode(secrets.token_bytes(32)).decode()
+
+# Client payloads record how their key was derived. New payloads use memory-hard
+# Argon2id; PBKDF2 payloads can still be decrypted.
+ENCRYPTION_METHOD_PBKDF2 = "PBKDF2-SHA256-Fernet"
+ENCRYPTION_METHOD_ARGON2ID = "Argon2id-Fernet"
+
+# Ciphers derived from client passwords, keyed by (method, password, salt), so repeat
+# decryptions skip PBKDF2. Cached keys are as sensitive as the passwords, so
+# this is off unless CLIENT_KEY_CACHE_SIZE is set.
+_client_fernet_cache: Optional[LRUCache] = (
+    LRUCache(maxsize=settings.client_key_cache_size) if settings.client_key_cache_size > 0 else None
+)
+_client_fernet_cache_lock = threading.Lock()
+
+
+def _derive_argon2id_key(
+    password: str,
+    salt: bytes,
+    time_cost: int = 3,
+    memory_cost: int = 64 * 1024,
+    parallelism: int = 4,
+    hash_len: int = 32
+) -> bytes:
+    """Derive a key from a password with Argon2id (memory_cost is in KiB)"""
+    from cryptography.hazmat.primitives.kdf.argon2 import Argon2id
+    
+    kdf = Argon2id(
+        salt=salt,
+        length=hash_len,
+        iterations=time_cost,
+        lanes=parallelism,
+        memory_cost=memory_cost,
+    )
+    return kdf.derive(password.encode())
+
+
+def _get_client_fernet(password: str, salt: bytes, method: str = ENCRYPTION_METHOD_ARGON2ID) -> "Fernet":
+    """Return the Fernet cipher for a client password, salt and key derivation method"""
+    from cryptography.fernet import Fernet
+    
+    cache_key = (method, password, salt)
+    if _client_fernet_cache is not None:
+        with _client_fernet_cache_lock:
+            fernet = _client_fernet_cache.get(cache_key)
+        if fernet is not None:
+            return fernet
+    
+    if method == ENCRYPTION_METHOD_ARGON2ID:
+        key = _derive_argon2id_key(password, salt)
+    elif method == ENCRYPTION_METHOD_PBKDF2:
+        key, _ = ClientEncryptionUtils.generate_client_key_from_password(password, salt)
+    else:
+        raise ValueError(f"Unsupported encryption method: {method}")
+    fernet = Fernet(base64.urlsafe_b64encode(key))
+    if _client_fernet_cache is not None:
+        with _client_fernet_cache_lock:
+            _client_fernet_cache[cache_key] = fernet
+    return fernet
+
+
+def clear_client_key_cache() -> None:
+    """Drop all cached client ciphers"""
+    if _client_fernet_cache is not None:
+        with _client_fernet_cache_lock:
+            _client_fernet_cache.clear()
+
 
 class ClientEncryptionUtils:
     """
@@ -126,6 +253,7 @@ class ClientEncryptionUtils:
     def generate_client_key_from_password(password: str, salt: Optional[bytes] = None) -> tuple[bytes, bytes]:
         """
         Generate an encryption key from a password using PBKDF2.
+        Used to decrypt legacy PBKDF2-SHA256-Fernet payloads.
         
         Args:
             password: The password to derive the key from
@@ -134,6 +262,9 @@ class ClientEncryptionUtils:
         Returns:
             Tuple of (key, salt) where key is the derived encryption key
         """
+        from cryptography.hazmat.primitives import hashes
+        from cryptography.hazmat.primitives.kdf.pbkdf2 import PBKDF2HMAC
+        
         if salt is None:
             salt = secrets.token_bytes(16)  # 128-bit salt
         
@@ -166,33 +297,24 @@ class ClientEncryptionUtils:
         Returns:
             Dictionary containing encrypted credentials and salt
         """
-        # Generate key from password
-        key, salt = ClientEncryptionUtils.generate_client_key_from_password(client_password)
-        
-        # Create Fernet cipher
-        fernet = Fernet(base64.urlsafe_b64encode(key))
+        # Derive the cipher from the password and a fresh 128-bit salt
+        salt = secrets.token_bytes(16)
+        fernet = _get_client_fernet(client_password, salt, ENCRYPTION_METHOD_ARGON2ID)
         
-        # Encrypt credentials
-        encrypted_access_key = base64.urlsafe_b64encode(
-            fernet.encrypt(access_key.encode())
-        ).decode()
-        
-        encrypted_secret_key = base64.urlsafe_b64encode(
-            fernet.encrypt(secret_key.encode())
-        ).decode()
+        # Encrypt credentials; Fernet tokens are already URL-safe base64 text
+        encrypted_access_key = fernet.encrypt(access_key.encode()).decode()
+        encrypted_secret_key = fernet.encrypt(secret_key.encode()).decode()
         
         encrypted_session_token = None
         if session_token:
-            encrypted_session_token = base64.urlsafe_b64encode(
-                fernet.encrypt(session_token.encode())
-            ).decode()
+            encrypted_session_token = fernet.encrypt(session_token.encode()).decode()
         
         return {
             "encrypted_aws_access_key": encrypted_access_key,
             "encrypted_aws_secret_key": encrypted_secret_key,
             "encrypted_aws_session_token": encrypted_session_token,
             "salt": base64.urlsafe_b64encode(salt).decode(),
-            "encryption_method": "PBKDF2-SHA256-Fernet"
+            "encryption_method": ENCRYPTION_METHOD_ARGON2ID
         }
     
     @staticmethod
@@ -212,25 +334,22 @@ class ClientEncryptionUtils:
         """
         # Recreate the key using the same salt
         salt = base64.urlsafe_b64decode(encrypted_data["salt"])
-        key, _ = ClientEncryptionUtils.generate_client_key_from_password(client_password, salt)
+        method = encrypted_data.get("encryption_method", ENCRYPTION_METHOD_PBKDF2)
+        fernet = _get_client_fernet(client_password, salt, method)
         
-        # Create Fernet cipher
-        fernet = Fernet(base64.urlsafe_b64encode(key))
+        # Legacy PBKDF2 payloads wrap each Fernet token in a second base64 layer
+        if method == ENCRYPTION_METHOD_PBKDF2:
+            unwrap = base64.urlsafe_b64decode
+        else:
+            unwrap = str.encode
         
         # Decrypt credentials
-        access_key = fernet.decrypt(
-            base64.urlsafe_b64decode(encrypted_data["encrypted_aws_access_key"])
-        ).decode()
-        
-        secret_key = fernet.decrypt(
-            base64.urlsafe_b64decode(encrypted_data["encrypted_aws_secret_key"])
-        ).decode()
+        access_key = fernet.decrypt(unwrap(encrypted_data["encrypted_aws_access_key"])).decode()
+        secret_key = fernet.decrypt(unwrap(encrypted_data["encrypted_aws_secret_key"])).decode()
         
         session_token = None
         if encrypted_data.get("encrypted_aws_session_token"):
-            session_token = fernet.decrypt(
-                base64.urlsafe_b64decode(encrypted_data["encrypted_aws_session_token"])
-            ).decode()
+            session_token = fernet.decrypt(unwrap(encrypted_data["encrypted_aws_session_token"])).decode()
         
         return {
             "aws_access_key": access_key,
@@ -239,12 +358,22 @@ class ClientEncryptionUtils:
         }
 
 
+class ScanRequestPayload(TypedDict):
+    """Body of a scan API request"""
+    encrypted_aws_access_key: str
+    encrypted_aws_secret_key: str
+    encrypted_aws_session_token: Optional[str]
+    tenant_id: str
+    excluded_regions: List[str]
+    scan_options: int
+
+
 def create_scan_request_payload(
     encrypted_credentials: Dict[str, str],
     tenant_id: str,
     excluded_regions: Optional[list] = None,
     scan_options: int = 840
-) -> Dict[str, Any]:
+) -> ScanRequestPayload:
     """
     Create a properly formatted scan request payload.
     
@@ -274,9 +403,8 @@ def generate_secure_tenant_id() -> str:
     Returns:
         Secure tenant ID string
     """
-    # Generate 16 random bytes and encode as hex
-    random_bytes = secrets.token_bytes(16)
-    return hashlib.sha256(random_bytes).hexdigest()[:24]  # 24 character hex string
+    # 12 random bytes as a 24 character lowercase hex string
+    return secrets.token_hex(12)
 
 
 # Example usage functions for testing/demonstration
@@ -306,7 +434,7 @@ def example_client_side_encryption():
     )
     
     print("Client-side encrypted payload:")
-    print(json.dumps(scan_payload, indent=2))
+    print(orjson.dumps(scan_payload, option=orjson.OPT_INDENT_2).decode())
     
     # Step 3: Demonstrate decryption (this would happen on backend)
     decrypted_creds = ClientEncryptionUtils.decrypt_credentials_from_client(
@@ -314,7 +442,7 @@ def example_client_side_encryption():
     )
     
     print("\nDecrypted credentials:")
-    print(json.dumps(decrypted_creds, indent=2))
+    print(orjson.dumps(decrypted_creds, option=orjson.OPT_INDENT_2).decode())
     
     return encrypted_creds, scan_payload
 
@@ -1,16 +1,37 @@
+import atexit
+import copy
 import logging
+import queue
 import sys
-import json
-from datetime import datetime
+import time
+from logging.handlers import QueueHandler, QueueListener
+import orjson
 from typing import Dict, Any, Optional
 
 
+def _iso_timestamp(created: float) -> str:
+    """Format a record's creation time as UTC ISO 8601 with microseconds"""
+    seconds = int(created)
+    t = time.gmtime(seconds)
+    micros = int((created - seconds) * 1_000_000)
+    return (
+        f"{t.tm_year:04d}-{t.tm_mon:02d}-{t.tm_mday:02d}"
+        f"T{t.tm_hour:02d}:{t.tm_min:02d}:{t.tm_sec:02d}.{micros:06d}Z"
+    )
+
+
+# Attributes every LogRecord has; anything else on a record came from extra=
+_STANDARD_RECORD_KEYS = frozenset(
+    logging.LogRecord("", 0, "", 0, "", (), None).__dict__
+) | {"message", "asctime"}
+
+
 class StructuredFormatter(logging.Formatter):
     """Custom formatter to output structured JSON logs"""
     
     def format(self, record):
         log_entry = {
-            "timestamp": datetime.utcnow().isoformat() + "Z",
+            "timestamp": _iso_timestamp(record.created),
             "level": record.levelname,
             "logger": record.name,
             "message": record.getMessage(),
@@ -19,15 +40,28 @@ class StructuredFormatter(logging.Formatter):
             "line": record.lineno,
         }
         
-        # Add extra fields if they exist
-        if hasattr(record, 'extra') and record.extra:
-            log_entry.update(record.extra)
+        # logging sets extra= fields as record attributes, not as record.extra
+        for key, value in record.__dict__.items():
+            if key not in _STANDARD_RECORD_KEYS:
+                log_entry[key] = value
         
         # Add exception info if present
         if record.exc_info:
             log_entry["exception"] = self.formatException(record.exc_info)
         
-        return json.dumps(log_entry, default=str)
+        return orjson.dumps(log_entry, default=str).decode()
+
+
+class _InProcessQueueHandler(QueueHandler):
+    """Queue handler that leaves formatting, including exceptions, to the listener"""
+    
+    def prepare(self, record):
+        # Resolve the message now, since its args may change after the call
+        # returns; exc_info is kept because the queue never leaves the process
+        record = copy.copy(record)
+        record.msg = record.getMessage()
+        record.args = None
+        return record
 
 
 class CloudLensLogger:
@@ -51,30 +85,42 @@ class CloudLensLogger:
         structured_formatter = StructuredFormatter()
         console_handler.setFormatter(structured_formatter)
         
-        self.logger.addHandler(console_handler)
+        # Formatting and stdout writes run on a listener thread; logging calls
+        # only enqueue the record
+        self._queue = queue.SimpleQueue()
+        self.logger.addHandler(_InProcessQueueHandler(self._queue))
+        self._listener = QueueListener(self._queue, console_handler, respect_handler_level=True)
+        self._listener.start()
+        atexit.register(self._listener.stop)
         
         # Prevent propagation to root logger
         self.logger.propagate = False
     
+    def _log(self, level: int, message: str, extra: Optional[Dict[str, Any]]):
+        """Log at a level, skipping all record work when the level is disabled"""
+        if self.logger.isEnabledFor(level):
+            # stacklevel=3 attributes the record to the caller, not these wrappers
+            self.logger.log(level, message, extra=extra, stacklevel=3)
+    
     def info(self, message: str, extra: Optional[Dict[str, Any]] = None):
         """Log info message with optional extra fields"""
-        self.logger.info(message, extra=extra or {})
+        self._log(logging.INFO, message, extra)
     
     def warning(self, message: str, extra: Optional[Dict[str, Any]] = None):
         """Log warning message with optional extra fields"""
-        self.logger.warning(message, extra=extra or {})
+        self._log(logging.WARNING, message, extra)
     
     def error(self, message: str, extra: Optional[Dict[str, Any]] = None):
         """Log error message with optional extra fields"""
-        self.logger.error(message, extra=extra or {})
+        self._log(logging.ERROR, message, extra)
     
     def debug(self, message: str, extra: Optional[Dict[str, Any]] = None):
         """Log debug message with optional extra fields"""
-        self.logger.debug(message, extra=extra or {})
+        self._log(logging.DEBUG, message, extra)
     
     def critical(self, message: str, extra: Optional[Dict[str, Any]] = None):
         """Log critical message with optional extra fields"""
-        self.logger.critical(message, extra=extra or {})
+        self._log(logging.CRITICAL, message, extra)
 
 
 # Create global logger instance